@@ -0,0 +1,322 @@
+"""Portfolio analytics module.
+
+Risk metrics over historical prices (``seriehistorica``) and an executor
+that runs them in a process pool, so one user's CPU-bound work does not
+hold the GIL for every Streamlit session.
+"""
+
+import hashlib
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+
+def price_matrix(history: Dict[str, List[Dict]]) -> Tuple[List[str], np.ndarray]:
+    """
+    Align historical quotes of several symbols into a price matrix.
+
+    Args:
+        history: Symbol -> rows from IOLClient.get_price_history
+
+    Returns:
+        Tuple of (symbols, prices) where prices is a contiguous float64
+        array of shape (days, symbols), forward-filled on missing days
+    """
+    frames = {
+        symbol: pd.Series(
+            [row.get("ultimoPrecio") for row in rows],
+            index=pd.to_datetime([row.get("fechaHora") for row in rows]).normalize(),
+            dtype=float,
+        )
+        for symbol, rows in history.items()
+        if rows
+    }
+    if not frames:
+        return [], np.empty((0, 0))
+
+    prices = pd.DataFrame(frames).sort_index()
+    prices = prices[~prices.index.duplicated(keep="last")].ffill().dropna()
+    return list(prices.columns), np.ascontiguousarray(prices.to_numpy(float))
+
+
+def _as_matrix(prices: np.ndarray) -> np.ndarray:
+    """View a 1-D price series as a single-column matrix."""
+    return prices.reshape(-1, 1) if prices.ndim == 1 else prices
+
+
+def log_returns(prices: np.ndarray) -> np.ndarray:
+    """Daily log returns per column."""
+    return np.diff(np.log(_as_matrix(prices)), axis=0)
+
+
+def volatility(prices: np.ndarray, periods: int = TRADING_DAYS) -> np.ndarray:
+    """Annualized volatility of daily log returns per column."""
+    return log_returns(prices).std(axis=0, ddof=1) * np.sqrt(periods)
+
+
+def max_drawdown(prices: np.ndarray) -> np.ndarray:
+    """Largest peak-to-trough decline per column (as a negative fraction)."""
+    prices = _as_matrix(prices)
+    peaks = np.maximum.accumulate(prices, axis=0)
+    return (prices / peaks - 1.0).min(axis=0)
+
+
+def correlation(prices: np.ndarray) -> np.ndarray:
+    """Correlation matrix of daily log returns."""
+    return np.atleast_2d(np.corrcoef(log_returns(prices), rowvar=False))
+
+
+def risk_metrics(prices: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Compute the standard risk metrics for a price matrix.
+
+    Args:
+        prices: Array of shape (days, symbols)
+
+    Returns:
+        Dict with total_return, volatility, max_drawdown and correlation;
+        NaN-filled when there are fewer than two days of prices
+    """
+    prices = _as_matrix(prices)
+    if len(prices) < 2:
+        columns = prices.shape[1]
+        return {
+            "total_return": np.full(columns, np.nan),
+            "volatility": np.full(columns, np.nan),
+            "max_drawdown": np.full(columns, np.nan),
+            "correlation": np.full((columns, columns), np.nan),
+        }
+    return {
+        "total_return": prices[-1] / prices[0] - 1.0,
+        "volatility": volatility(prices),
+        "max_drawdown": max_drawdown(prices),
+        "correlation": correlation(prices),
+    }
+
+
+def _run_shared(
+    func: Callable[[np.ndarray], Any], name: str, shape: Tuple, dtype: str
+) -> Any:
+    """Worker entry point: attach to shared memory and run func on it."""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        array = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        array.flags.writeable = False
+        result = func(array)
+        del array  # release the buffer export before closing
+        return result
+    finally:
+        shm.close()
+
+
+class AnalyticsExecutor:
+    """Run analytics functions in a process pool.
+
+    Inputs are copied once into shared memory and read in place by the
+    worker, results are cached by input hash, identical in-flight jobs are
+    shared, and all jobs of a session can be cancelled when the user
+    navigates away. Jobs wait in a local queue and are handed to the pool
+    only when a worker is free, so queued jobs can be dropped before they
+    run. Functions must be module-level (picklable by name).
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, cache_size: int = 128):
+        """
+        Initialize executor.
+
+        Args:
+            max_workers: Pool size (default: CPU count)
+            cache_size: Max cached results (LRU)
+        """
+        self._max_workers = max_workers or os.cpu_count() or 1
+        # spawn: forking a threaded Streamlit server is unsafe
+        self._pool = ProcessPoolExecutor(
+            max_workers=self._max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        self._cache_size = cache_size
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._pending: "OrderedDict[str, Tuple[Callable, np.ndarray]]" = OrderedDict()
+        self._running = 0
+        self._waiters: Dict[str, Set[Future]] = {}
+        self._sessions: Dict[str, Set[Future]] = {}
+        # Reentrant: future callbacks may run synchronously under the lock
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def input_key(func: Callable, array: np.ndarray) -> str:
+        """Hash a function name and array contents into a cache key."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{func.__module__}.{func.__qualname__}".encode())
+        digest.update(f"{array.shape}{array.dtype.str}".encode())
+        digest.update(np.ascontiguousarray(array).data)
+        return digest.hexdigest()
+
+    def submit(
+        self, session_id: str, func: Callable[[np.ndarray], Any], array: np.ndarray
+    ) -> Future:
+        """
+        Schedule func(array) in the pool.
+
+        Args:
+            session_id: Owner session, used by cancel_session
+            func: Module-level function taking a NumPy array
+            array: Input data (copied, so the caller may reuse it)
+
+        Returns:
+            Future with the result (already done on cache hit)
+        """
+        key = self.input_key(func, array)
+        outer: Future = Future()
+
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                outer.set_result(self._cache[key])
+                return outer
+
+            inner = self._inflight.get(key)
+            if inner is None:
+                inner = self._inflight[key] = Future()
+                self._pending[key] = (func, np.array(array, order="C"))
+            self._waiters.setdefault(key, set()).add(outer)
+            self._sessions.setdefault(session_id, set()).add(outer)
+
+        outer.add_done_callback(lambda f: self._forget(session_id, f))
+        inner.add_done_callback(lambda f: self._deliver(outer, f))
+        self._dispatch()
+        return outer
+
+    def _dispatch(self) -> None:
+        """Hand queued jobs to the pool while workers are free."""
+        failed = []
+        with self._lock:
+            while self._pending and self._running < self._max_workers:
+                key, (func, array) = self._pending.popitem(last=False)
+                inner = self._inflight[key]
+                inner.set_running_or_notify_cancel()
+                try:
+                    self._start(key, func, array, inner)
+                except Exception as e:
+                    self._inflight.pop(key, None)
+                    self._waiters.pop(key, None)
+                    failed.append((inner, e))
+
+        for inner, error in failed:
+            inner.set_exception(error)
+
+    def _start(
+        self, key: str, func: Callable, array: np.ndarray, inner: Future
+    ) -> None:
+        """Copy input to shared memory and submit the job (lock held)."""
+        shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        try:
+            np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+            job = self._pool.submit(
+                _run_shared, func, shm.name, array.shape, array.dtype.str
+            )
+        except BaseException:
+            shm.close()
+            shm.unlink()
+            raise
+
+        self._running += 1
+        job.add_done_callback(lambda f: self._finish(key, shm, inner, f))
+
+    def _finish(
+        self,
+        key: str,
+        shm: shared_memory.SharedMemory,
+        inner: Future,
+        job: Future,
+    ) -> None:
+        """Release shared memory, cache a result and start the next job."""
+        shm.close()
+        shm.unlink()
+        with self._lock:
+            self._running -= 1
+            self._inflight.pop(key, None)
+            self._waiters.pop(key, None)
+            if not job.cancelled() and job.exception() is None:
+                self._cache[key] = job.result()
+                while len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+
+        if job.cancelled():
+            inner.set_exception(CancelledError())
+        elif job.exception() is not None:
+            inner.set_exception(job.exception())
+        else:
+            inner.set_result(job.result())
+        self._dispatch()
+
+    @staticmethod
+    def _deliver(outer: Future, inner: Future) -> None:
+        """Propagate a job result to a caller future unless cancelled."""
+        if inner.cancelled():
+            outer.cancel()
+            return
+        if not outer.set_running_or_notify_cancel():
+            return
+        if inner.exception() is not None:
+            outer.set_exception(inner.exception())
+        else:
+            outer.set_result(inner.result())
+
+    def _forget(self, session_id: str, outer: Future) -> None:
+        """Drop a finished caller future from the bookkeeping."""
+        with self._lock:
+            self._sessions.get(session_id, set()).discard(outer)
+            if not self._sessions.get(session_id):
+                self._sessions.pop(session_id, None)
+
+    def cancel_session(self, session_id: str) -> int:
+        """
+        Cancel all pending jobs of a session.
+
+        Caller futures are cancelled immediately. Queued jobs no other
+        session waits on are dropped before reaching the pool; running jobs
+        finish and only populate the cache.
+
+        Args:
+            session_id: Session whose jobs to cancel
+
+        Returns:
+            Number of caller futures cancelled
+        """
+        with self._lock:
+            outers = self._sessions.pop(session_id, set())
+
+        cancelled = sum(outer.cancel() for outer in outers)
+
+        orphans = []
+        with self._lock:
+            for key, waiters in list(self._waiters.items()):
+                waiters.difference_update(outers)
+                if not waiters and key in self._pending:
+                    del self._pending[key]
+                    del self._waiters[key]
+                    orphans.append(self._inflight.pop(key))
+
+        for inner in orphans:
+            inner.cancel()
+        return cancelled
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the pool, cancelling jobs that have not started."""
+        with self._lock:
+            queued = [self._inflight.pop(key) for key in self._pending]
+            self._pending.clear()
+        for inner in queued:
+            inner.cancel()
+        self._pool.shutdown(wait=wait, cancel_futures=True)
@@ -1,7 +1,14 @@
 """IOL API Client module."""
 
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple, Union
+
 import requests
-from typing import Dict, List
 
 from src.exceptions import (
     IOLAPIError,
@@ -9,24 +16,68 @@ from src.exceptions import (
     RateLimitError,
     NetworkError,
 )
+from src.transport import RequestsTransport, Transport
+
+try:  # urllib3 only decodes brotli when one of these is installed
+    import brotli  # noqa: F401
+
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+
+        ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
+
+
+@dataclass
+class _CachedPayload:
+    """Last successful payload for an endpoint, plus its validators."""
+
+    digest: bytes
+    data: Any
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
 
 
 class IOLClient:
     """HTTP client for IOL API.
 
     This class handles all API requests to IOL.
-    It does NOT cache responses - caching is handled in the UI layer.
+    Identical GETs that are in flight at the same time (same account and
+    endpoint) are coalesced into a single HTTP request.
+
+    GETs are conditional: the last payloads (LRU, ``MAX_CACHED_PAYLOADS``)
+    are kept with their ETag/Last-Modified validators and body hash, so an
+    unchanged endpoint is neither downloaded (304) nor parsed again and
+    returns the same data object as the previous call. Results are
+    therefore shared between calls and must be treated as read-only.
+    Transfer counters live in ``stats``.
+
+    Keep one client per logged-in session for the session's lifetime
+    (e.g., in ``st.session_state``), not one per Streamlit rerun, or the
+    validators are lost between polls.
     """
 
     BASE_URL = "https://api.invertironline.com"
     TIMEOUT = 10  # seconds
 
-    def __init__(self, token: str):
+    MAX_CACHED_PAYLOADS = 32
+
+    # Shared across instances: several sessions (browser tabs) logged into
+    # the same account hold separate clients but should share requests
+    _inflight: Dict[Tuple, Future] = {}
+    _inflight_lock = threading.Lock()
+
+    def __init__(self, token: str, transport: Optional[Transport] = None):
         """
         Initialize client with access token.
 
         Args:
             token: Valid IOL access token
+            transport: Transport to send requests with
+                (default: RequestsTransport over ``session``)
         """
         self.token = token
         self.session = requests.Session()
@@ -34,8 +85,14 @@ class IOLClient:
             {
                 "Authorization": f"Bearer {token}",
                 "Content-Type": "application/json",
+                "Accept-Encoding": ACCEPT_ENCODING,
             }
         )
+        self.transport = transport or RequestsTransport(self.session)
+        self._payloads: "OrderedDict[Tuple, _CachedPayload]" = OrderedDict()
+        self._payloads_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats: Counter = Counter()
 
     def _request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
         """
@@ -53,9 +110,11 @@ class IOLClient:
             NetworkError: If connection fails
         """
         kwargs.setdefault("timeout", self.TIMEOUT)
+        # Explicit so that transports without our session still authenticate
+        kwargs["headers"] = {**self.session.headers, **(kwargs.get("headers") or {})}
 
         try:
-            response = self.session.request(
+            response = self.transport.send(
                 method,
                 f"{self.BASE_URL}{endpoint}",
                 **kwargs,
@@ -64,6 +123,168 @@ class IOLClient:
         except requests.exceptions.RequestException as e:
             raise NetworkError(e)
 
+    def _get(self, endpoint: str, **kwargs) -> Any:
+        """
+        GET an endpoint and return parsed data, coalescing concurrent calls.
+
+        The first caller for a given (token, endpoint, params) key performs the
+        request; callers arriving while it is outstanding wait on the same
+        future and receive the same parsed object (treat it as read-only).
+        Errors are propagated to every waiter.
+
+        Args:
+            endpoint: API endpoint path
+            **kwargs: Additional arguments for requests
+
+        Returns:
+            Parsed JSON data
+
+        Raises:
+            NetworkError: If connection fails
+            TokenExpiredError: If token is expired
+            RateLimitError: If rate limit is hit
+            IOLAPIError: For other API errors
+        """
+        params = kwargs.get("params") or {}
+        key = (self.token, endpoint, tuple(sorted(params.items())))
+
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(self._conditional_get(key, endpoint, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+        return future.result()
+
+    def _conditional_get(self, key: Tuple, endpoint: str, **kwargs) -> Any:
+        """
+        GET an endpoint reusing the previous payload when it did not change.
+
+        Args:
+            key: Payload cache key (token, endpoint, params)
+            endpoint: API endpoint path
+            **kwargs: Additional arguments for requests
+
+        Returns:
+            Parsed JSON data (the cached object if unchanged)
+
+        Raises:
+            IOLAPIError: If the server answers 304 with nothing cached
+        """
+        with self._payloads_lock:
+            cached = self._payloads.get(key)
+        headers = dict(kwargs.pop("headers", None) or {})
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        response = self._request("GET", endpoint, headers=headers, **kwargs)
+
+        if response.status_code == 304:
+            if cached is None:
+                raise IOLAPIError("Respuesta 304 sin datos previos en caché.")
+            self._count(requests=1, not_modified=1)
+            return cached.data
+
+        self._check_status(response)
+
+        raw = response.content
+        counters = {"requests": 1, "bytes_decoded": len(raw)}
+        # Content-Length is the on-the-wire (possibly compressed) size; chunked
+        # responses don't send it, so their wire size is unknown
+        if "Content-Length" in response.headers:
+            counters["bytes_received"] = int(response.headers["Content-Length"])
+        else:
+            counters["wire_size_unknown"] = 1
+        digest = hashlib.blake2b(raw, digest_size=16).digest()
+
+        if cached is not None and cached.digest == digest:
+            counters["unchanged"] = 1
+            data = cached.data
+        else:
+            data = self._parse_body(response)
+            counters["bytes_parsed"] = len(raw)
+        self._count(**counters)
+
+        with self._payloads_lock:
+            self._payloads[key] = _CachedPayload(
+                digest=digest,
+                data=data,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+            self._payloads.move_to_end(key)
+            while len(self._payloads) > self.MAX_CACHED_PAYLOADS:
+                self._payloads.popitem(last=False)
+        return data
+
+    def _count(self, **counters: int) -> None:
+        """Add to the transfer counters in ``stats``."""
+        with self._stats_lock:
+            self.stats.update(counters)
+
+    def pop_stats(self) -> Dict[str, int]:
+        """
+        Return transfer counters since the last call and reset them.
+
+        Call once per refresh to report its cost.
+
+        Returns:
+            Dict with counts of:
+                requests: HTTP requests sent
+                bytes_received: Wire (compressed) bytes, from Content-Length;
+                    responses without that header are not included
+                wire_size_unknown: Responses without Content-Length (chunked)
+                bytes_decoded: Decompressed body bytes of all responses
+                bytes_parsed: Decompressed bytes actually JSON-parsed
+                not_modified: 304 responses
+                unchanged: 200 responses identical to the cached body
+        """
+        with self._stats_lock:
+            snapshot = {
+                "requests": 0,
+                "bytes_received": 0,
+                "wire_size_unknown": 0,
+                "bytes_decoded": 0,
+                "bytes_parsed": 0,
+                "not_modified": 0,
+                "unchanged": 0,
+                **self.stats,
+            }
+            self.stats.clear()
+        return snapshot
+
+    def payload_digest(self, endpoint: str) -> Optional[str]:
+        """
+        Return the hash of the last payload fetched from an endpoint.
+
+        The digest only changes when the payload does, so it can be used as
+        a cache key to skip downstream recomputation.
+
+        Args:
+            endpoint: API endpoint path (without query params)
+
+        Returns:
+            Hex digest, or None if the endpoint was never fetched
+        """
+        with self._payloads_lock:
+            cached = self._payloads.get((self.token, endpoint, ()))
+        return cached.digest.hex() if cached else None
+
     def _check_response(self, response: requests.Response) -> Dict:
         """
         Check response for errors.
@@ -82,6 +303,20 @@ class IOLClient:
             RateLimitError: If rate limit is hit
             IOLAPIError: For other API errors
         """
+        self._check_status(response)
+        return self._parse_body(response)
+
+    def _check_status(self, response: requests.Response) -> None:
+        """
+        Check HTTP status code for errors.
+
+        Args:
+            response: Response object to check
+
+        Raises:
+            TokenExpiredError: If token is expired
+            RateLimitError: If rate limit is hit
+        """
         if response.status_code == 401:
             raise TokenExpiredError()
 
@@ -91,10 +326,24 @@ class IOLClient:
 
         response.raise_for_status()
 
+    def _parse_body(self, response: requests.Response) -> Any:
+        """
+        Parse JSON body, detecting errors disguised as success.
+
+        Args:
+            response: Response object with a 2xx status
+
+        Returns:
+            Parsed JSON data
+
+        Raises:
+            TokenExpiredError: If token is expired
+            IOLAPIError: For other API errors
+        """
         data = response.json()
 
         # Error disguised as success (IOL quirk)
-        if "error" in data:
+        if isinstance(data, dict) and "error" in data:
             error_code = data.get("code")
             if error_code == 401:
                 raise TokenExpiredError()
@@ -112,8 +361,7 @@ class IOLClient:
         Returns:
             Normalized dict with keys: activos, total, total_usd
         """
-        response = self._request("GET", f"/api/v2/portafolio/{country}")
-        data = self._check_response(response)
+        data = self._get(f"/api/v2/portafolio/{country}")
 
         # Normalize structure for UI
         return {
@@ -135,12 +383,163 @@ class IOLClient:
         Returns:
             List of quote dicts with symbol, price, variation, etc.
         """
-        response = self._request(
-            "GET",
-            f"/api/v2/Cotizaciones/{instrument}/{country}/Todos",
+        data = self._get(f"/api/v2/Cotizaciones/{instrument}/{country}/Todos")
+        return self._quote_list(data)
+
+    def get_panel_quotes(
+        self, panel: str, instrument: str = "acciones", country: str = "argentina"
+    ) -> List[Dict]:
+        """
+        Fetch market quotes for a single panel (e.g., Merval, General).
+
+        Args:
+            panel: Panel name as returned by get_panels
+            instrument: Instrument type (acciones, bonos, cedears, etc.)
+            country: Country code (default: argentina)
+
+        Returns:
+            List of quote dicts with symbol, price, variation, etc.
+        """
+        data = self._get(f"/api/v2/Cotizaciones/{instrument}/{panel}/{country}")
+        return self._quote_list(data)
+
+    def get_panels(
+        self, instrument: str = "acciones", country: str = "argentina"
+    ) -> List[Dict]:
+        """
+        Fetch available quote panels for an instrument type.
+
+        Args:
+            instrument: Instrument type (acciones, bonos, cedears, etc.)
+            country: Country code (default: argentina)
+
+        Returns:
+            List of panel dicts (e.g., {"panel": "Merval", ...})
+        """
+        data = self._get(f"/api/v2/{country}/Titulos/Cotizacion/Paneles/{instrument}")
+        return data if isinstance(data, list) else data.get("paneles", [])
+
+    def get_quote(self, symbol: str, market: str = "bCBA") -> Dict:
+        """
+        Fetch the current quote for a single instrument.
+
+        Args:
+            symbol: Instrument symbol (e.g., GGAL)
+            market: Market code (default: bCBA)
+
+        Returns:
+            Quote dict with ultimoPrecio, variacion, puntas, etc.
+        """
+        return self._get(f"/api/v2/{market}/Titulos/{symbol}/Cotizacion")
+
+    def get_price_history(
+        self,
+        symbol: str,
+        start: Union[str, date],
+        end: Union[str, date],
+        adjusted: bool = False,
+        market: str = "bCBA",
+    ) -> List[Dict]:
+        """
+        Fetch daily historical quotes for an instrument.
+
+        Args:
+            symbol: Instrument symbol (e.g., GGAL)
+            start: First date (YYYY-MM-DD or date)
+            end: Last date (YYYY-MM-DD or date)
+            adjusted: Adjust prices for corporate actions
+            market: Market code (default: bCBA)
+
+        Returns:
+            List of quote dicts with fechaHora, ultimoPrecio, apertura, etc.
+        """
+        ajustada = "ajustada" if adjusted else "sinAjustar"
+        data = self._get(
+            f"/api/v2/{market}/Titulos/{symbol}/Cotizacion/seriehistorica/"
+            f"{start}/{end}/{ajustada}"
         )
-        data = self._check_response(response)
+        return data if isinstance(data, list) else []
+
+    def get_mep_rate(self, symbol: str = "AL30") -> float:
+        """
+        Fetch the MEP dollar rate implied by a bond.
+
+        Args:
+            symbol: Bond symbol quoted in pesos and dollars (default: AL30)
+
+        Returns:
+            ARS per USD rate
+        """
+        data = self._get(f"/api/v2/Cotizaciones/MEP/{symbol}")
+        return float(data)
+
+    def get_fci_managers(self) -> List[Dict]:
+        """
+        Fetch mutual fund (FCI) managers.
+
+        Returns:
+            List of administradora dicts
+        """
+        data = self._get("/api/v2/Titulos/FCI/Administradoras")
+        return data if isinstance(data, list) else []
+
+    def get_fci_fund_types(self, manager: str) -> List[Dict]:
+        """
+        Fetch fund types offered by an FCI manager.
 
+        Args:
+            manager: Administradora identifier
+
+        Returns:
+            List of tipo de fondo dicts
+        """
+        data = self._get(f"/api/v2/Titulos/FCI/Administradoras/{manager}/TipoFondos")
+        return data if isinstance(data, list) else []
+
+    def get_fci_funds(self, manager: str, fund_type: str) -> List[Dict]:
+        """
+        Fetch funds of a manager for a fund type.
+
+        Args:
+            manager: Administradora identifier
+            fund_type: Tipo de fondo identifier
+
+        Returns:
+            List of fund dicts with simbolo, descripcion, moneda, etc.
+        """
+        data = self._get(
+            f"/api/v2/Titulos/FCI/Administradoras/{manager}/TipoFondos/{fund_type}"
+        )
+        return data if isinstance(data, list) else []
+
+    def get_fci(self, symbol: str) -> Dict:
+        """
+        Fetch detail for a single fund.
+
+        Args:
+            symbol: Fund symbol
+
+        Returns:
+            Fund detail dict
+        """
+        return self._get(f"/api/v2/Titulos/FCI/{symbol}")
+
+    def get_instrument_types(self, country: str = "argentina") -> List[Dict]:
+        """
+        Fetch instrument types quoted in a country.
+
+        Args:
+            country: Country code (default: argentina)
+
+        Returns:
+            List of dicts (e.g., {"instrumento": "Acciones", "pais": "argentina"})
+        """
+        data = self._get(f"/api/v2/{country}/Titulos/Cotizacion/Instrumentos")
+        return data if isinstance(data, list) else data.get("instrumentos", [])
+
+    @staticmethod
+    def _quote_list(data: Any) -> List[Dict]:
+        """Extract the list of quotes from a Cotizaciones response."""
         # Response is a list directly
         if isinstance(data, list):
             return data
@@ -155,13 +554,53 @@ class IOLClient:
         Returns:
             Dict with account balances by currency
         """
-        response = self._request("GET", "/api/v2/estadocuenta")
-        data = self._check_response(response)
+        data = self._get("/api/v2/estadocuenta")
 
         return {
             "cuentas": data.get("cuentas", []),
         }
 
+    def get_operations(
+        self,
+        status: Optional[str] = None,
+        start: Optional[Union[str, date]] = None,
+        end: Optional[Union[str, date]] = None,
+        country: Optional[str] = None,
+    ) -> List[Dict]:
+        """
+        Fetch the account's operations (orders and trades).
+
+        Args:
+            status: Filter by estado (todas, pendientes, terminadas, canceladas)
+            start: First order date (YYYY-MM-DD or date)
+            end: Last order date (YYYY-MM-DD or date)
+            country: Filter by country (argentina, estados_Unidos)
+
+        Returns:
+            List of operation dicts with numero, fechaOrden, tipo, estado, etc.
+        """
+        filters = {
+            "filtro.estado": status,
+            "filtro.fechaDesde": start,
+            "filtro.fechaHasta": end,
+            "filtro.pais": country,
+        }
+        params = {k: str(v) for k, v in filters.items() if v is not None}
+        data = self._get("/api/v2/operaciones", params=params)
+        return data if isinstance(data, list) else []
+
+    def get_operation(self, number: int) -> Dict:
+        """
+        Fetch a single operation with its current state and fills.
+
+        Args:
+            number: Operation number
+
+        Returns:
+            Operation detail dict
+        """
+        return self._get(f"/api/v2/operaciones/{number}")
+
     def get_instrument_detail(self, symbol: str, market: str = "bCBA") -> Dict:
         """
         Fetch detailed info for a specific instrument.
@@ -173,5 +612,4 @@ class IOLClient:
         Returns:
             Dict with instrument details
         """
-        response = self._request("GET", f"/api/v2/{market}/Titulos/{symbol}")
-        return self._check_response(response)
+        return self._get(f"/api/v2/{market}/Titulos/{symbol}")
@@ -5,6 +5,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Dict, Optional
 
 from src.exceptions import InvalidCredentialsError, NetworkError, TokenExpiredError
+from src.transport import RequestsTransport, Transport
 
 
 class IOLAuth:
@@ -17,8 +18,16 @@ class IOLAuth:
     BASE_URL = "https://api.invertironline.com"
     TOKEN_ENDPOINT = "/token"  # Note: Auth uses /token, not /api/v2/token
 
-    def __init__(self):
+    def __init__(self, transport: Optional[Transport] = None):
+        """
+        Initialize auth handler.
+
+        Args:
+            transport: Transport to send requests with
+                (default: RequestsTransport)
+        """
         self.token_data: Optional[Dict] = None
+        self.transport = transport or RequestsTransport()
 
     def login(self, username: str, password: str) -> Dict:
         """
@@ -42,7 +51,8 @@ class IOLAuth:
         }
 
         try:
-            response = requests.post(
+            response = self.transport.send(
+                "POST",
                 f"{self.BASE_URL}{self.TOKEN_ENDPOINT}",
                 data=payload,
                 headers={"Content-Type": "application/x-www-form-urlencoded"},
@@ -85,7 +95,8 @@ class IOLAuth:
         }
 
         try:
-            response = requests.post(
+            response = self.transport.send(
+                "POST",
                 f"{self.BASE_URL}{self.TOKEN_ENDPOINT}",
                 data=payload,
                 headers={"Content-Type": "application/x-www-form-urlencoded"},
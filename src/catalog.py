@@ -0,0 +1,406 @@
+"""Instrument catalog module.
+
+Local, disk-persisted index of instrument metadata (descripcion, mercado,
+tipo) with fast symbol/description search. Static data is fetched once and
+reused instead of calling get_instrument_detail on every view.
+"""
+
+import logging
+import threading
+import unicodedata
+from array import array
+from bisect import bisect_left, insort
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Union
+
+import requests
+
+from src.api_client import IOLClient
+from src.disk_cache import load_json, save_json
+from src.exceptions import IOLAPIError
+from src.rate_limit import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+# API path casing of the market codes found in quote listings
+MARKET_CODES = {
+    "BCBA": "bCBA",
+    "NYSE": "nYSE",
+    "NASDAQ": "nASDAQ",
+    "AMEX": "aMEX",
+    "BCS": "bCS",
+    "ROFX": "rOFX",
+}
+
+
+def _normalize(text: str) -> str:
+    """Lowercase and strip accents for matching."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def _trigrams(text: str) -> set:
+    """Return the set of 3-character substrings of normalized text."""
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _market_code(mercado: str) -> str:
+    """Market code for API paths from a listing's mercado (default: bCBA)."""
+    return MARKET_CODES.get((mercado or "").upper(), mercado or "bCBA")
+
+
+def _contains(postings: array, idx: int) -> bool:
+    """True if a sorted posting list contains idx."""
+    pos = bisect_left(postings, idx)
+    return pos < len(postings) and postings[pos] == idx
+
+
+class InstrumentCatalog:
+    """Compact in-memory instrument catalog with prefix and trigram search.
+
+    Records are stored column-wise: symbol and description lists plus
+    ``array`` columns of interned market/type codes, so tens of thousands of
+    instruments take a few MB. The search index (sorted symbols and sorted
+    trigram posting lists over normalized descriptions) is updated in place
+    by ``add``. One instance may be shared by all sessions: reads and
+    updates are serialized by a lock.
+    """
+
+    TTL = 7 * 24 * 3600  # seconds; instrument metadata rarely changes
+
+    def __init__(self):
+        self._symbols: List[str] = []
+        self._descriptions: List[str] = []
+        self._normalized: List[str] = []
+        self._markets = array("H")
+        self._types = array("H")
+        self._labels: List[str] = []
+        self._label_ids: Dict[str, int] = {}
+        self._by_symbol: Dict[str, int] = {}
+        # Symbols whose detail call failed or had no description
+        self._no_detail: Set[str] = set()
+
+        self._prefix_keys: List[str] = []
+        self._prefix_ids = array("I")
+        self._trigram_index: Dict[str, array] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self._by_symbol
+
+    def _label_id(self, label: str) -> int:
+        """Intern a market/type label and return its code."""
+        if label not in self._label_ids:
+            self._label_ids[label] = len(self._labels)
+            self._labels.append(label)
+        return self._label_ids[label]
+
+    def add(
+        self, symbol: str, descripcion: str = "", mercado: str = "", tipo: str = ""
+    ) -> None:
+        """
+        Add or update an instrument.
+
+        Args:
+            symbol: Instrument symbol (e.g., GGAL)
+            descripcion: Instrument description
+            mercado: Market code (e.g., BCBA)
+            tipo: Instrument type (e.g., acciones)
+        """
+        symbol = symbol.upper()
+        with self._lock:
+            idx = self._by_symbol.get(symbol)
+            if idx is None:
+                idx = self._by_symbol[symbol] = len(self._symbols)
+                self._symbols.append(symbol)
+                self._descriptions.append("")
+                self._normalized.append("")
+                self._markets.append(self._label_id(mercado or ""))
+                self._types.append(self._label_id(tipo or ""))
+                pos = bisect_left(self._prefix_keys, symbol.lower())
+                self._prefix_keys.insert(pos, symbol.lower())
+                self._prefix_ids.insert(pos, idx)
+            else:
+                if mercado:
+                    self._markets[idx] = self._label_id(mercado)
+                if tipo:
+                    self._types[idx] = self._label_id(tipo)
+            if descripcion and descripcion != self._descriptions[idx]:
+                self._set_description(idx, descripcion)
+                self._no_detail.discard(symbol)
+
+    def _set_description(self, idx: int, descripcion: str) -> None:
+        """Replace a description and move its trigram postings (lock held)."""
+        old = _trigrams(self._normalized[idx])
+        normalized = _normalize(descripcion)
+        new = _trigrams(normalized)
+        for gram in old - new:
+            postings = self._trigram_index[gram]
+            postings.pop(bisect_left(postings, idx))
+            if not postings:
+                del self._trigram_index[gram]
+        for gram in new - old:
+            # New rows have the highest id, so this is usually an append
+            insort(self._trigram_index.setdefault(gram, array("I")), idx)
+        self._descriptions[idx] = descripcion
+        self._normalized[idx] = normalized
+
+    def _record(self, idx: int) -> Dict:
+        """Expand a row into a record dict."""
+        return {
+            "simbolo": self._symbols[idx],
+            "descripcion": self._descriptions[idx],
+            "mercado": self._labels[self._markets[idx]],
+            "tipo": self._labels[self._types[idx]],
+        }
+
+    def get(self, symbol: str) -> Optional[Dict]:
+        """
+        Look up an instrument by symbol.
+
+        Args:
+            symbol: Instrument symbol (case-insensitive)
+
+        Returns:
+            Record dict with simbolo, descripcion, mercado, tipo, or None
+        """
+        with self._lock:
+            idx = self._by_symbol.get(symbol.upper())
+            return None if idx is None else self._record(idx)
+
+    def detail(
+        self,
+        client: IOLClient,
+        symbol: str,
+        market: Optional[str] = None,
+    ) -> Dict:
+        """
+        Return instrument metadata, fetching it only if not cataloged.
+
+        A failed or description-less detail call is remembered, so the
+        instrument is not fetched again until the catalog is rebuilt.
+
+        Args:
+            client: Authenticated IOLClient used on cache miss
+            symbol: Instrument symbol (e.g., GGAL)
+            market: Market code (default: the cataloged mercado, else bCBA)
+
+        Returns:
+            Record dict with simbolo, descripcion, mercado, tipo
+        """
+        record = self.get(symbol)
+        if record is not None and (
+            record["descripcion"] or record["simbolo"] in self._no_detail
+        ):
+            return record
+
+        if market is None:
+            market = _market_code(record["mercado"] if record else "")
+        try:
+            data = client.get_instrument_detail(symbol, market)
+        except (IOLAPIError, requests.HTTPError):
+            if record is not None:
+                with self._lock:
+                    self._no_detail.add(record["simbolo"])
+            raise
+        self.add(
+            symbol,
+            data.get("descripcion", ""),
+            data.get("mercado", ""),
+            data.get("tipo", ""),
+        )
+        if not data.get("descripcion"):
+            with self._lock:
+                self._no_detail.add(symbol.upper())
+        return self.get(symbol)
+
+    def _build_index(self) -> None:
+        """Build the symbol and trigram indexes from scratch (after loading)."""
+        self._normalized = [_normalize(desc) for desc in self._descriptions]
+        order = sorted(range(len(self._symbols)), key=self._symbols.__getitem__)
+        self._prefix_keys = [self._symbols[i].lower() for i in order]
+        self._prefix_ids = array("I", order)
+
+        index: Dict[str, array] = {}
+        for idx, normalized in enumerate(self._normalized):
+            for gram in _trigrams(normalized):
+                index.setdefault(gram, array("I")).append(idx)
+        self._trigram_index = index
+
+    def search(self, query: str, limit: int = 20) -> List[Dict]:
+        """
+        Search instruments by symbol prefix or description substring.
+
+        Symbol prefix matches come first (exact match on top), followed by
+        description matches.
+
+        Args:
+            query: Text to search (case and accent insensitive)
+            limit: Max results
+
+        Returns:
+            List of record dicts
+        """
+        needle = _normalize(query.strip())
+        if not needle:
+            return []
+
+        with self._lock:
+            hits: List[int] = []
+            pos = bisect_left(self._prefix_keys, needle)
+            while (
+                pos < len(self._prefix_keys)
+                and self._prefix_keys[pos].startswith(needle)
+                and len(hits) < limit
+            ):
+                hits.append(self._prefix_ids[pos])
+                pos += 1
+
+            if len(needle) >= 3 and len(hits) < limit:
+                postings = [self._trigram_index.get(g) for g in _trigrams(needle)]
+                if all(postings):
+                    # Walk the shortest sorted list in order and stop at the limit
+                    postings.sort(key=len)
+                    seen = set(hits)
+                    for idx in postings[0]:
+                        if (
+                            idx in seen
+                            or not all(_contains(other, idx) for other in postings[1:])
+                            or needle not in self._normalized[idx]
+                        ):
+                            continue
+                        hits.append(idx)
+                        if len(hits) >= limit:
+                            break
+
+            return [self._record(idx) for idx in hits]
+
+    def to_dict(self) -> Dict:
+        """Serialize to a compact column-oriented dict."""
+        with self._lock:
+            return {
+                "labels": list(self._labels),
+                "simbolos": list(self._symbols),
+                "descripciones": list(self._descriptions),
+                "mercados": self._markets.tolist(),
+                "tipos": self._types.tolist(),
+                "sin_detalle": sorted(self._no_detail),
+            }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "InstrumentCatalog":
+        """Rebuild a catalog serialized with to_dict."""
+        catalog = cls()
+        catalog._labels = list(data["labels"])
+        catalog._label_ids = {label: i for i, label in enumerate(catalog._labels)}
+        catalog._symbols = list(data["simbolos"])
+        catalog._descriptions = list(data["descripciones"])
+        catalog._markets = array("H", data["mercados"])
+        catalog._types = array("H", data["tipos"])
+        catalog._by_symbol = {s: i for i, s in enumerate(catalog._symbols)}
+        catalog._no_detail = set(data.get("sin_detalle", []))
+        catalog._build_index()
+        return catalog
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Persist the catalog to disk."""
+        save_json(path, self.to_dict())
+
+    @classmethod
+    def load(
+        cls, path: Union[str, Path], ttl: Optional[float] = TTL
+    ) -> Optional["InstrumentCatalog"]:
+        """
+        Load a persisted catalog if it is fresh.
+
+        Args:
+            path: Cache file path
+            ttl: Max age in seconds (None: never expires)
+
+        Returns:
+            InstrumentCatalog, or None if missing or expired
+        """
+        data = load_json(path, ttl)
+        return None if data is None else cls.from_dict(data)
+
+    @classmethod
+    def build(
+        cls,
+        client: IOLClient,
+        country: str = "argentina",
+        limiter: Optional[RateLimiter] = None,
+    ) -> "InstrumentCatalog":
+        """
+        Build a catalog from the instrument types and their quote listings.
+
+        Rows without a description are completed with instrument detail calls
+        on the row's market. A failed listing or detail call is logged and
+        skipped; the rest of the catalog is still built.
+
+        Args:
+            client: Authenticated IOLClient
+            country: Country code (default: argentina)
+            limiter: Shared RateLimiter (default: a new one)
+
+        Returns:
+            Populated InstrumentCatalog
+        """
+        limiter = limiter or RateLimiter()
+        catalog = cls()
+        limiter.acquire()
+        for item in client.get_instrument_types(country):
+            tipo = (item.get("instrumento") or "").lower()
+            if not tipo:
+                continue
+            limiter.acquire()
+            try:
+                rows = client.get_quotes(tipo, country)
+            except (IOLAPIError, requests.HTTPError) as e:
+                logger.warning("Skipping %s listing: %s", tipo, e)
+                continue
+            for row in rows:
+                symbol = row.get("simbolo")
+                if not symbol:
+                    continue
+                catalog.add(
+                    symbol, row.get("descripcion", ""), row.get("mercado", ""), tipo
+                )
+                if row.get("descripcion"):
+                    continue
+                limiter.acquire()
+                try:
+                    catalog.detail(client, symbol, _market_code(row.get("mercado")))
+                except (IOLAPIError, requests.HTTPError) as e:
+                    logger.warning("Skipping detail for %s: %s", symbol, e)
+        return catalog
+
+    @classmethod
+    def load_or_build(
+        cls,
+        client: IOLClient,
+        path: Union[str, Path],
+        country: str = "argentina",
+        ttl: Optional[float] = TTL,
+        limiter: Optional[RateLimiter] = None,
+    ) -> "InstrumentCatalog":
+        """
+        Load the persisted catalog, rebuilding and saving it when stale.
+
+        Args:
+            client: Authenticated IOLClient used to rebuild
+            path: Cache file path
+            country: Country code (default: argentina)
+            ttl: Max age in seconds
+            limiter: Shared RateLimiter used to rebuild (default: a new one)
+
+        Returns:
+            InstrumentCatalog
+        """
+        catalog = cls.load(path, ttl)
+        if catalog is None:
+            catalog = cls.build(client, country, limiter)
+            catalog.save(path)
+        return catalog
@@ -0,0 +1,61 @@
+"""On-disk JSON cache module.
+
+Used for slow-changing reference data (instrument catalog, FCI tree) that
+should survive app restarts. Every entry carries its save time so readers
+can enforce a TTL.
+"""
+
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional, Union
+
+
+def save_json(path: Union[str, Path], data: Any) -> None:
+    """
+    Atomically write data to a JSON cache file.
+
+    Args:
+        path: Cache file path (parent directories are created)
+        data: JSON-serializable payload
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(
+                {"saved_at": time.time(), "data": data},
+                f,
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def load_json(path: Union[str, Path], ttl: Optional[float] = None) -> Optional[Any]:
+    """
+    Read a JSON cache file if present and fresh.
+
+    Args:
+        path: Cache file path
+        ttl: Max age in seconds (None: never expires)
+
+    Returns:
+        Cached payload, or None if missing, expired or unreadable
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if ttl is not None and time.time() - entry.get("saved_at", 0) > ttl:
+        return None
+
+    return entry.get("data")
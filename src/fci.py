@@ -0,0 +1,342 @@
+"""Mutual fund (FCI) catalog module.
+
+Crawls the Administradoras -> TipoFondos -> fondos hierarchy concurrently
+under the rate limit and keeps it as a cached tree, so browsing funds reads
+local data and never waits on the network.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import requests
+
+from src.api_client import IOLClient
+from src.disk_cache import load_json, save_json
+from src.exceptions import IOLAPIError, RateLimitError
+from src.rate_limit import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Summary row fields mirrored in fund detail; daily fields such as
+# ultimoOperado or variacion are left out so they don't trigger refetches
+DETAIL_FIELDS = (
+    "descripcion",
+    "tipoFondo",
+    "tipoAdministradoraTituloFCI",
+    "horizonteInversion",
+    "perfilInversor",
+    "rescate",
+    "moneda",
+    "montoMinimo",
+    "invierte",
+)
+
+
+def _ident(item: Dict) -> str:
+    """Identifier used in FCI URLs for a manager or fund type."""
+    return str(item.get("identificador") or item.get("codigo") or item.get("nombre"))
+
+
+def _name(item: Dict) -> str:
+    """Display name for a manager or fund type."""
+    return str(item.get("nombre") or item.get("descripcion") or _ident(item))
+
+
+def _row_hash(row: Dict) -> str:
+    """Stable hash of the fields of a fund row that its detail depends on."""
+    relevant = {field: row.get(field) for field in DETAIL_FIELDS}
+    raw = json.dumps(relevant, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.blake2b(raw, digest_size=8).hexdigest()
+
+
+def _empty_tree() -> Dict:
+    """Tree for a catalog that was never crawled."""
+    return {"crawled_at": 0.0, "administradoras": {}, "fondos": {}}
+
+
+class FCICatalog:
+    """Cached FCI hierarchy with background refresh.
+
+    Tree layout (JSON-serializable, each fund stored once)::
+
+        {"crawled_at": ts,
+         "administradoras": {id: {"nombre": str,
+                                  "tipos": {id: {"nombre": str,
+                                                 "fondos": [simbolo, ...]}}}},
+         "fondos": {simbolo: {"hash": str, "resumen": {...}, "detalle": {...}}}}
+
+    A refresh re-lists managers, types and funds, and only fetches fund
+    detail for funds whose detail-relevant fields changed. A failed manager,
+    listing or detail keeps its previous entry; after a refresh with
+    failures the tree stays stale and background retries back off
+    exponentially.
+    """
+
+    TTL = 24 * 3600  # seconds
+    RATE = 30  # requests/minute of the default limiter, below IOL's ~120
+    RETRY_DELAY = 60.0  # seconds before the first retry after a failure
+
+    def __init__(
+        self,
+        client: IOLClient,
+        path: Optional[Union[str, Path]] = None,
+        ttl: float = TTL,
+        max_workers: int = 4,
+        limiter: Optional[RateLimiter] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize catalog, loading the persisted tree if any.
+
+        Args:
+            client: Authenticated IOLClient
+            path: Cache file path (None: memory only)
+            ttl: Seconds before the tree is considered stale
+            max_workers: Concurrent requests during a crawl
+            limiter: RateLimiter shared with the rest of the app's traffic
+                (default: a private bucket at RATE requests/minute, leaving
+                headroom for requests that don't go through it)
+            clock: Wall-clock time source (injectable for tests)
+        """
+        self.client = client
+        self.path = path
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self.limiter = limiter or RateLimiter(rate=self.RATE)
+        self._clock = clock
+        self._tree = (load_json(path) if path else None) or _empty_tree()
+        self._refresh_lock = threading.Lock()
+        self._thread_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._failures = 0
+        self._retry_at = 0.0
+        self._rate_limited: Optional[RateLimitError] = None
+        self.last_error: Optional[Exception] = None
+
+    @property
+    def is_stale(self) -> bool:
+        """True if the tree was never crawled or is older than the TTL."""
+        return self._clock() - self._tree["crawled_at"] >= self.ttl
+
+    def managers(self) -> List[Dict]:
+        """List cached managers as dicts with id and nombre."""
+        return [
+            {"id": manager_id, "nombre": node["nombre"]}
+            for manager_id, node in self._tree["administradoras"].items()
+        ]
+
+    def fund_types(self, manager: str) -> List[Dict]:
+        """List cached fund types of a manager as dicts with id and nombre."""
+        node = self._tree["administradoras"].get(manager, {})
+        return [
+            {"id": type_id, "nombre": tipo["nombre"]}
+            for type_id, tipo in node.get("tipos", {}).items()
+        ]
+
+    def funds(self, manager: str, fund_type: str) -> List[Dict]:
+        """List cached fund summary rows for a manager and fund type."""
+        tree = self._tree  # one snapshot: a refresh may swap it meanwhile
+        node = tree["administradoras"].get(manager, {})
+        symbols = node.get("tipos", {}).get(fund_type, {}).get("fondos", [])
+        return [tree["fondos"][symbol]["resumen"] for symbol in symbols]
+
+    def fund(self, symbol: str) -> Optional[Dict]:
+        """Return cached fund detail (or summary if no detail), or None."""
+        entry = self._tree["fondos"].get(symbol)
+        if entry is None:
+            return None
+        return entry.get("detalle") or entry["resumen"]
+
+    def _call(self, func: Callable, *args) -> Any:
+        """Call the API under the rate limiter."""
+        self.limiter.acquire()
+        return func(*args)
+
+    def _try_call(self, errors: List[Exception], func: Callable, *args) -> Any:
+        """
+        Call the API, logging and collecting failures (None on failure).
+
+        A rate limit response is not a per-node failure: it is raised, and
+        every later call of the crawl raises it too without a request.
+        """
+        if self._rate_limited is not None:
+            raise self._rate_limited
+        try:
+            return self._call(func, *args)
+        except RateLimitError as e:
+            self._rate_limited = e
+            raise
+        except (IOLAPIError, requests.HTTPError) as e:
+            logger.warning("FCI %s%s failed: %s", func.__name__, args, e)
+            errors.append(e)
+            return None
+
+    def refresh(self) -> int:
+        """
+        Crawl the hierarchy and swap in the new tree (blocking).
+
+        Failures below the manager list are logged and the previous entries
+        kept; the tree then keeps its old crawl time so it is retried. A
+        rate limit response aborts the crawl and raises RateLimitError.
+
+        Returns:
+            Number of fund details fetched (changed or new leaves)
+        """
+        with self._refresh_lock:
+            self._rate_limited = None
+            try:
+                fetched, errors = self._crawl()
+            except Exception as e:
+                self._record_failure(e)
+                raise
+            if errors:
+                self._record_failure(errors[-1])
+            else:
+                self._failures = 0
+                self._retry_at = 0.0
+                self.last_error = None
+            return fetched
+
+    def _record_failure(self, error: Exception) -> None:
+        """Remember a failed refresh and push back the next retry."""
+        self.last_error = error
+        self._failures += 1
+        delay = min(self.RETRY_DELAY * 2 ** (self._failures - 1), self.ttl)
+        if isinstance(error, RateLimitError):
+            delay = max(delay, error.retry_after)
+        self._retry_at = self._clock() + delay
+
+    def _crawl(self) -> Tuple[int, List[Exception]]:
+        """Crawl and swap in the new tree (refresh lock held)."""
+        old = self._tree
+        old_funds = old["fondos"]
+        errors: List[Exception] = []
+
+        with ThreadPoolExecutor(self.max_workers) as pool:
+            managers = self._call(self.client.get_fci_managers)
+            manager_ids = [_ident(m) for m in managers]
+            types_per_manager = list(
+                pool.map(
+                    lambda m: self._try_call(errors, self.client.get_fci_fund_types, m),
+                    manager_ids,
+                )
+            )
+
+            administradoras: Dict[str, Dict] = {}
+            leaves: List[Tuple[str, str]] = []
+            for manager, manager_id, tipos in zip(
+                managers, manager_ids, types_per_manager
+            ):
+                if tipos is None:  # keep the previous node, funds and all
+                    previous = old["administradoras"].get(manager_id)
+                    if previous is not None:
+                        administradoras[manager_id] = previous
+                    continue
+                administradoras[manager_id] = {
+                    "nombre": _name(manager),
+                    "tipos": {
+                        _ident(tipo): {"nombre": _name(tipo), "fondos": []}
+                        for tipo in tipos
+                    },
+                }
+                leaves.extend((manager_id, _ident(tipo)) for tipo in tipos)
+
+            fund_lists = list(
+                pool.map(
+                    lambda leaf: self._try_call(
+                        errors, self.client.get_fci_funds, *leaf
+                    ),
+                    leaves,
+                )
+            )
+
+            fondos: Dict[str, Dict] = {}
+            changed: List[str] = []
+            for (manager_id, type_id), rows in zip(leaves, fund_lists):
+                node = administradoras[manager_id]["tipos"][type_id]
+                if rows is None:  # keep the previous listing
+                    previous = old["administradoras"].get(manager_id, {})
+                    kept = previous.get("tipos", {}).get(type_id, {})
+                    node["fondos"] = list(kept.get("fondos", []))
+                    continue
+                for row in rows:
+                    symbol = row.get("simbolo")
+                    if not symbol:
+                        continue
+                    node["fondos"].append(symbol)
+                    if symbol in fondos:  # listed under several types
+                        continue
+                    row_hash = _row_hash(row)
+                    previous = old_funds.get(symbol)
+                    if previous and previous["hash"] == row_hash:
+                        fondos[symbol] = {**previous, "resumen": row}
+                    else:
+                        fondos[symbol] = {"hash": row_hash, "resumen": row}
+                        changed.append(symbol)
+
+            # Funds only reachable through kept (failed) nodes keep their entry
+            for node in administradoras.values():
+                for tipo in node["tipos"].values():
+                    for symbol in tipo["fondos"]:
+                        if symbol not in fondos and symbol in old_funds:
+                            fondos[symbol] = old_funds[symbol]
+
+            details = pool.map(
+                lambda s: self._try_call(errors, self.client.get_fci, s), changed
+            )
+            fetched = 0
+            for symbol, detail in zip(changed, details):
+                if detail is not None:
+                    fondos[symbol]["detalle"] = detail
+                    fetched += 1
+                    continue
+                # Keep the old detail and hash so the next crawl retries
+                previous = old_funds.get(symbol, {})
+                fondos[symbol]["hash"] = previous.get("hash")
+                if "detalle" in previous:
+                    fondos[symbol]["detalle"] = previous["detalle"]
+
+        self._tree = {
+            "crawled_at": old["crawled_at"] if errors else self._clock(),
+            "administradoras": administradoras,
+            "fondos": fondos,
+        }
+        if self.path:
+            save_json(self.path, self._tree)
+        return fetched, errors
+
+    def refresh_in_background(self) -> bool:
+        """
+        Start a refresh thread if the tree is stale and none is running.
+
+        After failed refreshes, no new one starts before the backoff delay.
+
+        Returns:
+            True if a refresh was started
+        """
+        with self._thread_lock:
+            if (
+                not self.is_stale
+                or self._clock() < self._retry_at
+                or (self._thread and self._thread.is_alive())
+            ):
+                return False
+
+            self._thread = threading.Thread(
+                target=self._background_refresh, daemon=True
+            )
+            self._thread.start()
+            return True
+
+    def _background_refresh(self) -> None:
+        """Thread target: refresh and log (not raise) failures."""
+        try:
+            self.refresh()
+        except Exception:
+            logger.exception("FCI catalog refresh failed")
@@ -0,0 +1,110 @@
+"""Dollar rates module.
+
+Short-TTL cache of MEP and CCL rates shared by all valuations, so a repaint
+fetches rates at most once per TTL instead of once per position.
+"""
+
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from src.api_client import IOLClient
+
+
+@dataclass(frozen=True)
+class DollarRates:
+    """ARS per USD rates at a point in time."""
+
+    mep: float
+    ccl: float
+    fetched_at: float
+
+
+class RateCache:
+    """Cache MEP/CCL rates for a short TTL.
+
+    MEP comes from ``/Cotizaciones/MEP/{simbolo}``. IOL has no CCL endpoint,
+    so CCL is implied from the same bond's peso price over its cable-settled
+    (``C`` suffix) price.
+    """
+
+    TTL = 60  # seconds
+
+    def __init__(
+        self,
+        client: IOLClient,
+        bond: str = "AL30",
+        market: str = "bCBA",
+        ttl: float = TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize rate cache.
+
+        Args:
+            client: Authenticated IOLClient
+            bond: Reference bond for MEP/CCL (default: AL30)
+            market: Market code for CCL quotes (default: bCBA)
+            ttl: Seconds before rates are re-fetched
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.client = client
+        self.bond = bond
+        self.market = market
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._rates: Optional[DollarRates] = None
+
+    def get(self) -> DollarRates:
+        """
+        Return cached rates, fetching them if missing or expired.
+
+        Returns:
+            DollarRates with mep and ccl
+        """
+        with self._lock:
+            now = self._clock()
+            if self._rates is None or now - self._rates.fetched_at >= self.ttl:
+                self._rates = DollarRates(
+                    mep=self._fetch_mep(),
+                    ccl=self._fetch_ccl(),
+                    fetched_at=now,
+                )
+            return self._rates
+
+    def invalidate(self) -> None:
+        """Drop cached rates so the next get() re-fetches."""
+        with self._lock:
+            self._rates = None
+
+    def _fetch_mep(self) -> float:
+        """
+        MEP rate from the API.
+
+        Returns:
+            MEP rate; the previous rate (or NaN if none) when the API
+            returns zero or nothing
+        """
+        mep = float(self.client.get_mep_rate(self.bond) or 0)
+        if not mep:
+            return self._rates.mep if self._rates else math.nan
+        return mep
+
+    def _fetch_ccl(self) -> float:
+        """
+        Implied CCL: bond price in pesos / cable-settled price in dollars.
+
+        Returns:
+            CCL rate; the previous rate (or NaN if none) when either price
+            is missing or zero, e.g. before the cable bond trades
+        """
+        pesos = self.client.get_quote(self.bond, self.market)
+        cable = self.client.get_quote(f"{self.bond}C", self.market)
+        pesos_price = float(pesos.get("ultimoPrecio") or 0)
+        cable_price = float(cable.get("ultimoPrecio") or 0)
+        if not pesos_price or not cable_price:
+            return self._rates.ccl if self._rates else math.nan
+        return pesos_price / cable_price
@@ -0,0 +1,330 @@
+"""Operations history module.
+
+Incrementally mirrors ``/api/v2/operaciones`` into a local SQLite table
+indexed by symbol and date, so trade history and realized P&L queries never
+re-download the full log.
+"""
+
+import json
+import sqlite3
+import threading
+from collections import defaultdict, deque
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from src.api_client import IOLClient
+from src.rate_limit import RateLimiter
+
+FULL_HISTORY_START = "2000-01-01"
+
+# States after which an operation can no longer change
+FINAL_STATES = {"terminada", "cancelada", "rechazada", "vencida"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS operaciones (
+    numero INTEGER PRIMARY KEY,
+    simbolo TEXT NOT NULL,
+    tipo TEXT NOT NULL,
+    estado TEXT NOT NULL,
+    fecha TEXT NOT NULL,
+    cantidad REAL NOT NULL,
+    precio REAL NOT NULL,
+    raw TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_operaciones_simbolo_fecha
+    ON operaciones (simbolo, fecha);
+CREATE INDEX IF NOT EXISTS idx_operaciones_fecha ON operaciones (fecha);
+CREATE TABLE IF NOT EXISTS sync_state (
+    clave TEXT PRIMARY KEY,
+    valor TEXT NOT NULL
+);
+"""
+
+
+def _row(
+    op: Dict,
+    estado: Optional[str],
+    fecha: Optional[str],
+    cantidad: Any,
+    precio: Any,
+) -> tuple:
+    """Build a table row from mapped fields and the raw operation."""
+    return (
+        int(op["numero"]),
+        (op.get("simbolo") or "").upper(),
+        (op.get("tipo") or "").lower(),
+        (estado or "").lower(),
+        (fecha or "")[:19],
+        float(cantidad or 0),
+        float(precio or 0),
+        json.dumps(op, ensure_ascii=False, separators=(",", ":")),
+    )
+
+
+def _to_row(op: Dict) -> tuple:
+    """Flatten an operation from the ``/operaciones`` list into a table row."""
+    return _row(
+        op,
+        op.get("estado"),
+        op.get("fechaOperada") or op.get("fechaOrden"),
+        op.get("cantidadOperada") or op.get("cantidad"),
+        op.get("precioOperado") or op.get("precio"),
+    )
+
+
+def _detail_to_row(op: Dict) -> tuple:
+    """
+    Flatten an ``/operaciones/{numero}`` detail into a table row.
+
+    The detail lists fills under ``operaciones``; the row gets their total
+    quantity and quantity-weighted average price, falling back to the
+    ordered quantity and limit price while nothing was filled.
+    """
+    fills = [f for f in op.get("operaciones") or [] if f.get("cantidad")]
+    cantidad = sum(float(f["cantidad"]) for f in fills)
+    if cantidad:
+        precio = sum(float(f["cantidad"]) * float(f["precio"]) for f in fills)
+        precio /= cantidad
+        fecha = op.get("fechaOperado") or max(f.get("fecha") or "" for f in fills)
+    else:
+        cantidad, precio = op.get("cantidad"), op.get("precio")
+        fecha = op.get("fechaOperado")
+    return _row(
+        op, op.get("estadoActual"), fecha or op.get("fechaAlta"), cantidad, precio
+    )
+
+
+class OperationStore:
+    """Local operations table with an incremental sync cursor.
+
+    The cursor (high-water mark) is the last operation number and date seen.
+    Each sync re-reads only a small window before that date and re-checks
+    operations that were still open, upserting anything new or changed.
+    """
+
+    OVERLAP = timedelta(days=1)
+
+    def __init__(self, path: Union[str, Path] = ":memory:"):
+        """
+        Open (or create) the store.
+
+        Args:
+            path: SQLite database file (default: in memory)
+        """
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        """Close the underlying database."""
+        self._conn.close()
+
+    def _get_state(self, key: str) -> Optional[str]:
+        row = self._conn.execute(
+            "SELECT valor FROM sync_state WHERE clave = ?", (key,)
+        ).fetchone()
+        return row["valor"] if row else None
+
+    def _set_state(self, key: str, value: str) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO sync_state (clave, valor) VALUES (?, ?)",
+            (key, value),
+        )
+
+    @property
+    def high_water_mark(self) -> Dict[str, Optional[str]]:
+        """Last synced operation number and date."""
+        with self._lock:
+            return {
+                "numero": self._get_state("ultimo_numero"),
+                "fecha": self._get_state("ultima_fecha"),
+            }
+
+    def upsert(self, operations: List[Dict]) -> int:
+        """
+        Insert new operations and update changed ones.
+
+        Args:
+            operations: Operation dicts from the API
+
+        Returns:
+            Number of rows inserted or changed
+        """
+        rows = [_to_row(op) for op in operations if op.get("numero") is not None]
+        return self._upsert_rows(rows)
+
+    def _upsert_rows(self, rows: List[tuple]) -> int:
+        """Write rows, updating existing ones only if a mapped field changed."""
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                """
+                INSERT INTO operaciones
+                    (numero, simbolo, tipo, estado, fecha, cantidad, precio, raw)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (numero) DO UPDATE SET
+                    simbolo = excluded.simbolo,
+                    tipo = excluded.tipo,
+                    estado = excluded.estado,
+                    fecha = excluded.fecha,
+                    cantidad = excluded.cantidad,
+                    precio = excluded.precio,
+                    raw = excluded.raw
+                WHERE (simbolo, tipo, estado, fecha, cantidad, precio) IS NOT
+                    (excluded.simbolo, excluded.tipo, excluded.estado,
+                     excluded.fecha, excluded.cantidad, excluded.precio)
+                """,
+                rows,
+            )
+            changed = self._conn.total_changes - before
+
+            if rows:
+                numero = max(row[0] for row in rows)
+                fecha = max(row[4] for row in rows)
+                last_numero = int(self._get_state("ultimo_numero") or 0)
+                last_fecha = self._get_state("ultima_fecha") or ""
+                self._set_state("ultimo_numero", str(max(numero, last_numero)))
+                self._set_state("ultima_fecha", max(fecha, last_fecha))
+        return changed
+
+    def sync(
+        self,
+        client: IOLClient,
+        today: Optional[date] = None,
+        limiter: Optional[RateLimiter] = None,
+    ) -> int:
+        """
+        Fetch operations new since the high-water mark and refresh open ones.
+
+        Args:
+            client: Authenticated IOLClient
+            today: End of the sync window (default: today)
+            limiter: Shared RateLimiter for the per-operation detail calls
+                (default: a new one)
+
+        Returns:
+            Number of operations inserted or changed
+        """
+        today = today or date.today()
+        last = self.high_water_mark["fecha"]
+        if last:
+            start = (datetime.fromisoformat(last).date() - self.OVERLAP).isoformat()
+        else:
+            start = FULL_HISTORY_START
+
+        changed = self.upsert(client.get_operations(start=start, end=today))
+
+        # Operations still open before the window may have been filled since
+        placeholders = ",".join("?" * len(FINAL_STATES))
+        with self._lock:
+            open_numbers = [
+                row["numero"]
+                for row in self._conn.execute(
+                    f"SELECT numero FROM operaciones WHERE fecha < ? "
+                    f"AND estado NOT IN ({placeholders})",
+                    (start, *FINAL_STATES),
+                )
+            ]
+        limiter = limiter or RateLimiter()
+        rows = []
+        for numero in open_numbers:
+            limiter.acquire()
+            rows.append(
+                _detail_to_row({"numero": numero, **client.get_operation(numero)})
+            )
+        return changed + self._upsert_rows(rows)
+
+    def trades(
+        self,
+        symbol: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        executed_only: bool = True,
+    ) -> List[Dict]:
+        """
+        Return operations for a symbol, oldest first.
+
+        Args:
+            symbol: Instrument symbol (e.g., GGAL)
+            start: First date, inclusive (YYYY-MM-DD)
+            end: Last date, inclusive (YYYY-MM-DD)
+            executed_only: Only include terminada operations
+
+        Returns:
+            List of dicts with numero, simbolo, tipo, estado, fecha,
+            cantidad, precio
+        """
+        query = (
+            "SELECT numero, simbolo, tipo, estado, fecha, cantidad, precio "
+            "FROM operaciones WHERE simbolo = ?"
+        )
+        args: List = [symbol.upper()]
+        if start:
+            query += " AND fecha >= ?"
+            args.append(start)
+        if end:
+            # "T99" sorts after any time on the end date
+            query += " AND fecha < ?"
+            args.append(f"{end}T99")
+        if executed_only:
+            query += " AND estado = 'terminada'"
+        query += " ORDER BY fecha, numero"
+
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(query, args)]
+
+    def realized_pnl(
+        self, start: Optional[str] = None, end: Optional[str] = None
+    ) -> Dict[str, float]:
+        """
+        Realized P&L per symbol for sales in a period, matching lots FIFO.
+
+        Purchases before the period are used as cost basis. Commissions are
+        not included.
+
+        Args:
+            start: First date, inclusive (YYYY-MM-DD)
+            end: Last date, inclusive (YYYY-MM-DD)
+
+        Returns:
+            Dict mapping symbol to realized P&L in the operation currency
+        """
+        query = (
+            "SELECT simbolo, tipo, fecha, cantidad, precio FROM operaciones "
+            "WHERE estado = 'terminada'"
+        )
+        args: List = []
+        if end:
+            query += " AND fecha < ?"
+            args.append(f"{end}T99")
+        query += " ORDER BY simbolo, fecha, numero"
+
+        lots: Dict[str, deque] = defaultdict(deque)
+        pnl: Dict[str, float] = defaultdict(float)
+        with self._lock:
+            rows = self._conn.execute(query, args).fetchall()
+
+        for row in rows:
+            symbol, qty, price = row["simbolo"], row["cantidad"], row["precio"]
+            if row["tipo"] == "compra":
+                lots[symbol].append([qty, price])
+                continue
+            if row["tipo"] != "venta":
+                continue
+
+            gain = 0.0
+            while qty > 0 and lots[symbol]:
+                lot = lots[symbol][0]
+                used = min(qty, lot[0])
+                gain += used * (price - lot[1])
+                lot[0] -= used
+                qty -= used
+                if lot[0] <= 0:
+                    lots[symbol].popleft()
+
+            if not start or row["fecha"] >= start:
+                pnl[symbol] += gain
+
+        return dict(pnl)
@@ -0,0 +1,91 @@
+"""Portfolio business logic module."""
+
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from src.fx import DollarRates
+
+VALUATION_COLUMNS = [
+    "origen",
+    "simbolo",
+    "moneda",
+    "valor",
+    "ars",
+    "usd_mep",
+    "usd_ccl",
+]
+
+
+def _is_dollar(currency: str) -> bool:
+    """Detect dollar denominations (DOLARES, dolar_Estadounidense, USD...)."""
+    currency = (currency or "").lower()
+    return "dolar" in currency or currency == "usd"
+
+
+def value_portfolio(
+    portfolio: Dict, cuentas: List[Dict], rates: DollarRates
+) -> pd.DataFrame:
+    """
+    Revalue positions and cash accounts in ARS, USD-MEP and USD-CCL.
+
+    All rows are converted in one vectorized pass with a single set of rates:
+    dollar amounts go to pesos at MEP, then pesos are expressed in each
+    dollar rate.
+
+    Args:
+        portfolio: Normalized portfolio from IOLClient.get_portfolio
+        cuentas: Accounts from IOLClient.get_account_status()["cuentas"]
+        rates: Dollar rates (e.g., from RateCache.get)
+
+    Returns:
+        DataFrame with columns origen, simbolo, moneda, valor, ars,
+        usd_mep, usd_ccl (one row per position and per account)
+    """
+    origen, simbolo, moneda, valor = [], [], [], []
+
+    for activo in portfolio.get("activos", []):
+        titulo = activo.get("titulo", {})
+        origen.append("activo")
+        simbolo.append(titulo.get("simbolo", ""))
+        moneda.append(titulo.get("moneda", "peso_Argentino"))
+        valor.append(activo.get("valorizado", activo.get("valorActual", 0)) or 0)
+
+    for cuenta in cuentas:
+        origen.append("cuenta")
+        simbolo.append("")
+        moneda.append(cuenta.get("moneda", cuenta.get("tipo", "")))
+        valor.append(cuenta.get("total", cuenta.get("saldo", 0)) or 0)
+
+    values = np.asarray(valor, dtype=float)
+    is_dollar = np.fromiter((_is_dollar(m) for m in moneda), bool, len(moneda))
+    ars = np.where(is_dollar, values * rates.mep, values)
+
+    return pd.DataFrame(
+        {
+            "origen": origen,
+            "simbolo": simbolo,
+            "moneda": moneda,
+            "valor": values,
+            "ars": ars,
+            "usd_mep": ars / rates.mep,
+            "usd_ccl": ars / rates.ccl,
+        },
+        columns=VALUATION_COLUMNS,
+    )
+
+
+def valuation_totals(valuation: pd.DataFrame) -> Dict[str, float]:
+    """
+    Sum a valuation into totals per currency view.
+
+    Args:
+        valuation: DataFrame from value_portfolio
+
+    Returns:
+        Dict with ars, usd_mep and usd_ccl totals; a total is NaN when any
+        of its values is (e.g., no CCL rate), rather than silently partial
+    """
+    totals = valuation[["ars", "usd_mep", "usd_ccl"]].sum(skipna=False)
+    return {key: float(value) for key, value in totals.items()}
@@ -0,0 +1,220 @@
+"""Quote request planning module.
+
+Chooses the cheapest mix of panel and per-symbol quote requests for a set of
+symbols, instead of always downloading the full ``Todos`` universe. Panel
+names are discovered from the API and their membership is learned the first
+time each panel is fetched.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import (
+    Collection,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Set,
+    Tuple,
+)
+
+import requests
+
+from src.api_client import IOLClient
+from src.exceptions import IOLAPIError
+
+logger = logging.getLogger(__name__)
+
+# Cost of one HTTP round trip, expressed in parsed quote rows
+REQUEST_COST = 20
+
+# Assumed row counts of panels whose membership was never fetched
+TODOS_SIZE_ESTIMATE = 300
+PANEL_SIZE_ESTIMATE = 30
+
+# Market used for per-symbol quotes of each panel country
+COUNTRY_MARKETS = {"argentina": "bCBA", "estados_Unidos": "nYSE"}
+
+
+@dataclass(frozen=True)
+class QuotePlan:
+    """Requests needed to cover a symbol set."""
+
+    panels: Tuple[str, ...]
+    symbols: Tuple[str, ...]
+    cost: int
+
+
+def _unexplained(panel: str, remaining: Set[str], known: Set[str]) -> Set[str]:
+    """Symbols an unknown panel is assumed to provide ("Todos" has them all)."""
+    return remaining if panel == "Todos" else remaining - known
+
+
+def plan_quotes(
+    symbols: Iterable[str],
+    panel_members: Mapping[str, Optional[Collection[str]]],
+    request_cost: int = REQUEST_COST,
+    panel_sizes: Optional[Mapping[str, int]] = None,
+) -> QuotePlan:
+    """
+    Plan the cheapest combination of panel and per-symbol requests.
+
+    Greedy weighted set cover: a panel costs one request plus one unit per
+    row it returns, a per-symbol call costs one request plus one row. Panels
+    are picked while they save more than the per-symbol calls they replace.
+
+    A panel whose membership is unknown (None) is costed at its estimated
+    size and optimistically assumed to hold as many wanted symbols as it
+    has rows, counting only symbols no known panel other than "Todos"
+    holds. Planning stops after such a panel unless it is assumed to cover
+    everything left; re-plan once its membership is known.
+
+    Args:
+        symbols: Symbols whose quotes are needed
+        panel_members: Symbols per panel (may include "Todos"), or None
+            for panels not fetched yet
+        request_cost: Cost of one request in row units
+        panel_sizes: Estimated row counts of unknown panels (default:
+            TODOS_SIZE_ESTIMATE for "Todos", PANEL_SIZE_ESTIMATE otherwise)
+
+    Returns:
+        QuotePlan with panels and symbols to fetch, and its estimated cost
+    """
+    remaining = set(symbols)
+    single_cost = request_cost + 1
+    sizes = {"Todos": TODOS_SIZE_ESTIMATE, **(panel_sizes or {})}
+    members = {
+        panel: set(syms) for panel, syms in panel_members.items() if syms is not None
+    }
+    estimated = {
+        panel: sizes.get(panel, PANEL_SIZE_ESTIMATE)
+        for panel, syms in panel_members.items()
+        if syms is None
+    }
+    in_known_panels = set().union(
+        *(syms for panel, syms in members.items() if panel != "Todos")
+    )
+    panels: List[str] = []
+    cost = 0
+
+    while remaining:
+        best_panel, best_saving = None, 0
+        for panel, syms in members.items():
+            covered = len(syms & remaining)
+            saving = covered * single_cost - (request_cost + len(syms))
+            if saving > best_saving:
+                best_panel, best_saving = panel, saving
+        for panel, size in estimated.items():
+            covered = min(size, len(_unexplained(panel, remaining, in_known_panels)))
+            saving = covered * single_cost - (request_cost + size)
+            if saving > best_saving:
+                best_panel, best_saving = panel, saving
+
+        if best_panel is None:
+            break
+
+        panels.append(best_panel)
+        if best_panel in estimated:
+            size = estimated.pop(best_panel)
+            cost += request_cost + size
+            unexplained = _unexplained(best_panel, remaining, in_known_panels)
+            if size < len(unexplained):
+                break  # what else is needed depends on the panel's members
+            remaining -= unexplained
+        else:
+            syms = members.pop(best_panel)
+            cost += request_cost + len(syms)
+            remaining -= syms
+
+    cost += len(remaining) * single_cost
+    return QuotePlan(panels=tuple(panels), symbols=tuple(sorted(remaining)), cost=cost)
+
+
+def discover_panels(
+    client: IOLClient,
+    panel_members: MutableMapping[str, Optional[Collection[str]]],
+    instrument: str = "acciones",
+    country: str = "argentina",
+) -> None:
+    """
+    Add the API's panel names (and "Todos") with unknown membership.
+
+    Panels already in ``panel_members`` are left as they are. A failed
+    panel listing is logged; planning then only considers "Todos".
+
+    Args:
+        client: Authenticated IOLClient
+        panel_members: Symbols per panel, updated in place
+        instrument: Instrument type (acciones, bonos, cedears, etc.)
+        country: Country code (default: argentina)
+    """
+    try:
+        items = client.get_panels(instrument, country)
+    except (IOLAPIError, requests.HTTPError) as e:
+        logger.warning("Could not list %s panels: %s", instrument, e)
+        items = []
+    for item in items:
+        name = item.get("panel") or item.get("nombre")
+        if name:
+            panel_members.setdefault(name, None)
+    panel_members.setdefault("Todos", None)
+
+
+def fetch_quotes(
+    client: IOLClient,
+    symbols: Iterable[str],
+    panel_members: MutableMapping[str, Optional[Collection[str]]],
+    instrument: str = "acciones",
+    country: str = "argentina",
+    market: Optional[str] = None,
+) -> Dict[str, Dict]:
+    """
+    Fetch quotes for a symbol set following the cheapest plan.
+
+    Pass the same ``panel_members`` on every refresh (one per instrument
+    and country). When empty, panel names are discovered with one
+    get_panels call; each panel's membership is learned the first time it
+    is fetched and updated in place, so later plans get more accurate.
+
+    Args:
+        client: Authenticated IOLClient
+        symbols: Symbols whose quotes are needed
+        panel_members: Symbols per panel (None: not fetched yet), updated
+        instrument: Instrument type (acciones, bonos, cedears, etc.)
+        country: Country code (default: argentina)
+        market: Market code for per-symbol calls (default: derived from
+            country, see COUNTRY_MARKETS)
+
+    Returns:
+        Dict mapping symbol to quote dict, only for requested symbols
+    """
+    wanted = set(symbols)
+    market = market or COUNTRY_MARKETS.get(country, "bCBA")
+    if not panel_members:
+        discover_panels(client, panel_members, instrument, country)
+    quotes: Dict[str, Dict] = {}
+
+    while True:
+        plan = plan_quotes(wanted - quotes.keys(), panel_members)
+        exploring = any(panel_members.get(p) is None for p in plan.panels)
+        for panel in plan.panels:
+            if panel == "Todos":
+                rows = client.get_quotes(instrument, country)
+            else:
+                rows = client.get_panel_quotes(panel, instrument, country)
+            panel_members[panel] = {
+                row["simbolo"] for row in rows if row.get("simbolo")
+            }
+            for row in rows:
+                if row.get("simbolo") in wanted:
+                    quotes[row["simbolo"]] = row
+        if not exploring:
+            break  # plan was made from known membership
+
+    # Planned singles plus symbols missing from stale panel membership
+    for symbol in sorted(wanted - quotes.keys()):
+        quotes[symbol] = {"simbolo": symbol, **client.get_quote(symbol, market)}
+
+    return quotes
@@ -0,0 +1,53 @@
+"""Client-side rate limiting module."""
+
+import threading
+import time
+from typing import Callable
+
+
+class RateLimiter:
+    """Thread-safe token bucket.
+
+    Keeps bulk crawls under IOL's (undocumented) ~120 requests/minute limit
+    while allowing short bursts.
+    """
+
+    def __init__(
+        self,
+        rate: int = 120,
+        per: float = 60.0,
+        burst: int = 10,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize limiter.
+
+        Args:
+            rate: Requests allowed per period
+            per: Period length in seconds
+            burst: Max requests allowed back to back
+            clock: Monotonic time source (injectable for tests)
+            sleep: Sleep function (injectable for tests)
+        """
+        self._interval = per / rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                elapsed = now - self._last
+                self._tokens = min(self._burst, self._tokens + elapsed / self._interval)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) * self._interval
+            self._sleep(wait)
@@ -0,0 +1,351 @@
+"""Session state module.
+
+Keeps per-user deltas (portfolio, cuentas, preferences) per session and
+references market data (quote panels, instrument metadata) from one shared,
+immutable, reference-counted store, under a global memory budget. Create a
+single SessionManager per process (e.g., with ``st.cache_resource``) instead
+of caching market data in each ``st.session_state``.
+"""
+
+import gc
+import sys
+import threading
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+def freeze(value: Any) -> Any:
+    """
+    Return a deeply immutable copy of JSON-like data.
+
+    Dicts become read-only mappings and lists become tuples, so shared
+    data cannot be modified by one session under another's feet.
+
+    Args:
+        value: JSON-like data (dicts, lists, scalars)
+
+    Returns:
+        Frozen equivalent
+    """
+    if isinstance(value, (dict, MappingProxyType)):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def deep_sizeof(value: Any) -> int:
+    """
+    Approximate memory footprint of nested data in bytes.
+
+    Args:
+        value: Object to measure (containers are traversed once)
+
+    Returns:
+        Size in bytes
+    """
+    seen = set()
+    stack = [value]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, MappingProxyType):
+            # getsizeof only sees the proxy; count the dict it wraps too
+            stack.extend(gc.get_referents(obj))
+        elif isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+    return total
+
+
+class _SharedEntry:
+    """Frozen value with its size and reference count."""
+
+    __slots__ = ("value", "size", "refs")
+
+    def __init__(self, value: Any, size: int):
+        self.value = value
+        self.size = size
+        self.refs = 0
+
+
+class SharedStore:
+    """Immutable, reference-counted store for data shared across sessions.
+
+    Values are frozen on insert and sized once. Entries nobody references
+    stay cached (LRU order) until memory pressure evicts them.
+    """
+
+    def __init__(self):
+        self._entries: "OrderedDict[Hashable, _SharedEntry]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def put(self, key: Hashable, value: Any) -> Any:
+        """
+        Store a value under a key unless it is already present.
+
+        Use a content key (e.g., IOLClient.payload_digest) so identical
+        payloads fetched by different sessions share one copy.
+
+        Args:
+            key: Content key
+            value: JSON-like data
+
+        Returns:
+            The stored frozen value
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                frozen = freeze(value)
+                entry = _SharedEntry(frozen, deep_sizeof(frozen))
+                self._entries[key] = entry
+            self._entries.move_to_end(key)
+            return entry.value
+
+    def get(self, key: Hashable) -> Any:
+        """Return the frozen value for a key (KeyError if missing)."""
+        with self._lock:
+            self._entries.move_to_end(key)
+            return self._entries[key].value
+
+    def acquire(self, key: Hashable) -> None:
+        """Add a reference to an entry."""
+        with self._lock:
+            self._entries[key].refs += 1
+
+    def release(self, key: Hashable) -> None:
+        """Drop a reference to an entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.refs > 0:
+                entry.refs -= 1
+
+    def refcount(self, key: Hashable) -> int:
+        """Number of sessions referencing an entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.refs if entry else 0
+
+    def evict_unreferenced(self, bytes_needed: int) -> int:
+        """
+        Evict least recently used unreferenced entries.
+
+        Args:
+            bytes_needed: Stop once this many bytes were freed
+
+        Returns:
+            Bytes freed
+        """
+        freed = 0
+        with self._lock:
+            for key in list(self._entries):
+                if freed >= bytes_needed:
+                    break
+                entry = self._entries[key]
+                if entry.refs == 0:
+                    del self._entries[key]
+                    freed += entry.size
+        return freed
+
+    def memory_usage(self) -> Dict[Hashable, int]:
+        """Bytes per entry."""
+        with self._lock:
+            return {key: entry.size for key, entry in self._entries.items()}
+
+
+class _Session:
+    """Per-user deltas and references into the shared store."""
+
+    __slots__ = ("deltas", "sizes", "refs", "last_access")
+
+    def __init__(self, now: float):
+        self.deltas: Dict[str, Any] = {}
+        self.sizes: Dict[str, int] = {}
+        self.refs: Dict[str, Hashable] = {}
+        self.last_access = now
+
+
+class SessionManager:
+    """Per-session deltas plus shared market data under a memory budget.
+
+    When the total (shared store + all session deltas) exceeds the budget,
+    unreferenced shared entries are evicted first, then whole idle sessions
+    in least-recently-used order; an evicted user simply reloads on their
+    next rerun.
+    """
+
+    def __init__(
+        self,
+        budget_bytes: int = 256 * 1024 * 1024,
+        min_idle: float = 60.0,
+        store: Optional[SharedStore] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize manager.
+
+        Args:
+            budget_bytes: Global memory budget
+            min_idle: Seconds without access before a session may be evicted
+            store: Shared store (default: a new one)
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.budget_bytes = budget_bytes
+        self.min_idle = min_idle
+        self.store = store or SharedStore()
+        self._clock = clock
+        self._sessions: "OrderedDict[str, _Session]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def _session(self, session_id: str) -> _Session:
+        """Get or create a session and mark it most recently used."""
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = _Session(self._clock())
+        session.last_access = self._clock()
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def has_session(self, session_id: str) -> bool:
+        """True if the session is live (not ended or evicted)."""
+        return session_id in self._sessions
+
+    def set(self, session_id: str, name: str, value: Any) -> None:
+        """
+        Store a per-user delta (portfolio, cuentas, preferences...).
+
+        Args:
+            session_id: Session identifier
+            name: Component name
+            value: Data owned by this session only
+        """
+        size = deep_sizeof(value)
+        with self._lock:
+            session = self._session(session_id)
+            session.deltas[name] = value
+            session.sizes[name] = size
+        self.enforce_budget()
+
+    def get(self, session_id: str, name: str, default: Any = None) -> Any:
+        """
+        Read a per-user delta or, failing that, a shared reference.
+
+        Args:
+            session_id: Session identifier
+            name: Component name
+            default: Returned when the component is not set
+
+        Returns:
+            The session's value, the shared frozen value, or default
+        """
+        with self._lock:
+            if session_id not in self._sessions:
+                return default
+            session = self._session(session_id)
+            if name in session.deltas:
+                return session.deltas[name]
+            key = session.refs.get(name)
+            if key is not None and key in self.store:
+                return self.store.get(key)
+            return default
+
+    def share(self, session_id: str, name: str, key: Hashable, value: Any) -> Any:
+        """
+        Point a session component at shared data, storing it if new.
+
+        Args:
+            session_id: Session identifier
+            name: Component name (e.g., "quotes:acciones")
+            key: Content key for the shared value
+            value: Data to store if the key is not present yet
+
+        Returns:
+            The shared frozen value
+        """
+        with self._lock:
+            session = self._session(session_id)
+            frozen = self.store.put(key, value)
+            previous = session.refs.get(name)
+            if previous != key:
+                self.store.acquire(key)
+                if previous is not None:
+                    self.store.release(previous)
+                session.refs[name] = key
+        self.enforce_budget()
+        return frozen
+
+    def end_session(self, session_id: str) -> None:
+        """Drop a session and release its shared references."""
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is not None:
+                for key in session.refs.values():
+                    self.store.release(key)
+
+    def total_bytes(self) -> int:
+        """Current footprint of the shared store and all sessions."""
+        with self._lock:
+            shared = sum(self.store.memory_usage().values())
+            sessions = sum(sum(s.sizes.values()) for s in self._sessions.values())
+            return shared + sessions
+
+    def enforce_budget(self) -> int:
+        """
+        Evict until under budget: unreferenced shared data, then idle sessions.
+
+        Returns:
+            Number of sessions evicted
+        """
+        evicted = 0
+        with self._lock:
+            excess = self.total_bytes() - self.budget_bytes
+            if excess <= 0:
+                return 0
+
+            excess -= self.store.evict_unreferenced(excess)
+            now = self._clock()
+            for session_id in list(self._sessions):
+                if excess <= 0:
+                    break
+                session = self._sessions[session_id]
+                if now - session.last_access < self.min_idle:
+                    break  # OrderedDict is LRU: the rest are more recent
+                self.end_session(session_id)
+                evicted += 1
+                excess = self.total_bytes() - self.budget_bytes
+                excess -= self.store.evict_unreferenced(excess)
+        return evicted
+
+    def memory_report(self) -> Dict[str, Any]:
+        """
+        Report memory usage per component.
+
+        Returns:
+            Dict with budget and total bytes, shared bytes per key (with
+            refcounts) and, per session, bytes per delta component
+        """
+        with self._lock:
+            return {
+                "budget_bytes": self.budget_bytes,
+                "total_bytes": self.total_bytes(),
+                "shared": {
+                    str(key): {"bytes": size, "refs": self.store.refcount(key)}
+                    for key, size in self.store.memory_usage().items()
+                },
+                "sessions": {
+                    session_id: dict(session.sizes)
+                    for session_id, session in self._sessions.items()
+                },
+            }
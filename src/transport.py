@@ -0,0 +1,287 @@
+"""HTTP transport module.
+
+IOLClient and IOLAuth send every request through a transport. The default
+one uses ``requests``; the recording and replay transports capture a
+session to a cassette file and play it back deterministically (for
+performance regression tests), optionally with the original latencies.
+"""
+
+import gzip
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+    Union,
+)
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+CASSETTE_VERSION = 1
+
+# Response headers worth keeping in a cassette. Bodies are stored decoded,
+# so Content-Encoding is dropped; Content-Length is kept as the original
+# wire size (what IOLClient.stats counts as bytes_received).
+RECORDED_HEADERS = (
+    "Content-Type",
+    "Content-Length",
+    "ETag",
+    "Last-Modified",
+    "Retry-After",
+)
+
+# Token fields replaced before a recording is written
+REDACTED_FIELDS = ("access_token", "refresh_token")
+
+# Account-identifying fields, also redacted when recording a real account
+ACCOUNT_FIELDS = (
+    "numero",
+    "numeroCuenta",
+    "nombre",
+    "apellido",
+    "email",
+    "dni",
+    "cuit",
+    "cuil",
+    "username",
+)
+
+
+class Transport(Protocol):
+    """What IOLClient and IOLAuth need from a transport."""
+
+    def send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request and return the response."""
+        ...
+
+
+class RequestsTransport:
+    """Send requests over a ``requests.Session``."""
+
+    def __init__(self, session: Optional[requests.Session] = None):
+        """
+        Initialize transport.
+
+        Args:
+            session: Session to use (default: a new one)
+        """
+        self.session = session or requests.Session()
+
+    def send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request.
+
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            **kwargs: Arguments for requests.Session.request
+
+        Returns:
+            Response object
+        """
+        return self.session.request(method, url, **kwargs)
+
+
+def _full_url(method: str, url: str, params: Optional[Dict]) -> str:
+    """URL including encoded query params, used as the cassette match key."""
+    return requests.Request(method, url, params=params).prepare().url
+
+
+def _redact_value(data: Any, fields: Tuple[str, ...]) -> Any:
+    """Replace values of the given keys anywhere in decoded JSON."""
+    if isinstance(data, dict):
+        return {
+            key: "REDACTED" if key in fields else _redact_value(value, fields)
+            for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return [_redact_value(item, fields) for item in data]
+    return data
+
+
+def _redact(body: str, fields: Tuple[str, ...] = REDACTED_FIELDS) -> str:
+    """Replace the values of sensitive fields in a JSON body."""
+    if not any(f'"{field}"' in body for field in fields):
+        return body
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return body
+    return json.dumps(
+        _redact_value(data, fields), ensure_ascii=False, separators=(",", ":")
+    )
+
+
+def save_cassette(path: Union[str, Path], interactions: List[Dict]) -> None:
+    """
+    Write interactions to a cassette (gzip-compressed if path ends in .gz).
+
+    Args:
+        path: Cassette file path
+        interactions: Recorded interactions
+    """
+    raw = json.dumps(
+        {"version": CASSETTE_VERSION, "interactions": interactions},
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(gzip.compress(raw) if path.suffix == ".gz" else raw)
+
+
+def load_cassette(path: Union[str, Path]) -> List[Dict]:
+    """
+    Read interactions from a cassette file.
+
+    Args:
+        path: Cassette file path (.json or .json.gz)
+
+    Returns:
+        List of interactions
+    """
+    raw = Path(path).read_bytes()
+    if raw[:2] == b"\x1f\x8b":
+        raw = gzip.decompress(raw)
+    return json.loads(raw)["interactions"]
+
+
+class RecordingTransport:
+    """Wrap another transport and record every interaction.
+
+    Each interaction stores method, full URL, status, selected headers,
+    body text and the latency of the call. Request bodies are never stored
+    and sensitive fields in responses (tokens by default) are redacted.
+    """
+
+    def __init__(
+        self,
+        inner: Optional[Transport] = None,
+        clock: Callable[[], float] = time.perf_counter,
+        redact: Iterable[str] = REDACTED_FIELDS,
+    ):
+        """
+        Initialize recorder.
+
+        Args:
+            inner: Transport that performs the requests (default: requests)
+            clock: Timer used to measure latency
+            redact: Response JSON keys whose values are replaced, at any
+                depth (e.g., REDACTED_FIELDS + ACCOUNT_FIELDS)
+        """
+        self.inner = inner or RequestsTransport()
+        self.redact = tuple(redact)
+        self.interactions: List[Dict] = []
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send through the inner transport and record the result."""
+        started = self._clock()
+        response = self.inner.send(method, url, **kwargs)
+        elapsed = self._clock() - started
+
+        interaction = {
+            "method": method.upper(),
+            "url": _full_url(method, url, kwargs.get("params")),
+            "status": response.status_code,
+            "headers": {
+                name: response.headers[name]
+                for name in RECORDED_HEADERS
+                if name in response.headers
+            },
+            "body": _redact(response.text, self.redact),
+            "latency": round(elapsed, 6),
+        }
+        with self._lock:
+            self.interactions.append(interaction)
+        return response
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the recorded interactions to a cassette file."""
+        with self._lock:
+            save_cassette(path, list(self.interactions))
+
+
+class ReplayTransport:
+    """Serve responses from a cassette instead of the network.
+
+    Requests are matched by method and full URL; repeated requests to the
+    same URL get the recorded responses in order, the last one repeating
+    once exhausted. Unmatched requests raise ConnectionError, which the
+    clients surface as NetworkError.
+    """
+
+    def __init__(
+        self,
+        interactions: List[Dict],
+        realtime: bool = False,
+        speed: float = 1.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize replay.
+
+        Args:
+            interactions: Interactions (e.g., from load_cassette)
+            realtime: Sleep for each recorded latency
+            speed: Latency divisor when realtime (2.0 = twice as fast)
+            sleep: Sleep function (injectable for tests)
+        """
+        self.realtime = realtime
+        self.speed = speed
+        self._sleep = sleep
+        self._interactions = interactions
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.rewind()
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], **kwargs) -> "ReplayTransport":
+        """Create a replay transport from a cassette file."""
+        return cls(load_cassette(path), **kwargs)
+
+    def rewind(self) -> None:
+        """Restart playback from the first recorded response."""
+        queues: Dict[Tuple[str, str], Deque[Dict]] = defaultdict(deque)
+        for interaction in self._interactions:
+            queues[(interaction["method"], interaction["url"])].append(interaction)
+        with self._lock:
+            self._queues = queues
+            self.calls = 0
+
+    def send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Return the next recorded response for this request."""
+        full_url = _full_url(method, url, kwargs.get("params"))
+        with self._lock:
+            queue = self._queues.get((method.upper(), full_url))
+            if not queue:
+                raise requests.exceptions.ConnectionError(
+                    f"No recorded response for {method.upper()} {full_url}"
+                )
+            interaction = queue.popleft() if len(queue) > 1 else queue[0]
+            self.calls += 1
+
+        if self.realtime:
+            self._sleep(interaction["latency"] / self.speed)
+
+        response = requests.Response()
+        response.status_code = interaction["status"]
+        response.reason = ""
+        response.headers = CaseInsensitiveDict(interaction["headers"])
+        response._content = interaction["body"].encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = full_url
+        response.request = requests.Request(method, full_url).prepare()
+        return response
@@ -0,0 +1,68 @@
+"""Benchmark fixture for replayed sessions.
+
+A small stand-in for pytest-benchmark: each benchmark runs a callable for a
+number of rounds and records wall time and peak traced allocations. Results
+are printed in the terminal summary and, if ``IOL_BENCH_JSON`` is set,
+written there so runs can be compared across commits.
+"""
+
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+import pytest
+
+_results_key = pytest.StashKey[List[Dict]]()
+
+
+@pytest.fixture
+def replay_benchmark(request):
+    """Return run(func, rounds) -> (last result, stats dict)."""
+
+    def run(func: Callable[[], Any], rounds: int = 20):
+        func()  # warm-up: imports, regex compiles, first-touch allocations
+
+        timings = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            result = func()
+            timings.append(time.perf_counter() - started)
+
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        stats = {
+            "name": request.node.name,
+            "rounds": rounds,
+            "min_ms": min(timings) * 1000,
+            "median_ms": statistics.median(timings) * 1000,
+            "peak_kib": peak / 1024,
+        }
+        request.config.stash.setdefault(_results_key, []).append(stats)
+        return result, stats
+
+    return run
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Print benchmark results and optionally save them as JSON."""
+    results = config.stash.get(_results_key, [])
+    if not results:
+        return
+
+    terminalreporter.section("replay benchmarks")
+    for stats in results:
+        terminalreporter.write_line(
+            f"{stats['name']:<48} min {stats['min_ms']:8.3f} ms  "
+            f"median {stats['median_ms']:8.3f} ms  peak {stats['peak_kib']:9.1f} KiB"
+        )
+
+    output = os.environ.get("IOL_BENCH_JSON")
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
@@ -0,0 +1,143 @@
+"""Reference dashboard refresh session for record/replay benchmarks.
+
+Record a cassette against the real API (credentials from the environment)::
+
+    python -m tests.benchmarks.session /tmp/refresh.json
+
+Tokens and account identifiers are redacted, but positions and balances of
+the real account remain: keep such recordings out of the repository.
+
+Only the simulated cassette is committed. Record it against the
+fixture-backed simulator::
+
+    python -m tests.benchmarks.session --simulate \\
+        tests/fixtures/cassettes/refresh_session.json
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Callable, Dict
+
+from src.api_client import IOLClient
+from src.auth import IOLAuth
+from src.fx import RateCache
+from src.portfolio import valuation_totals, value_portfolio
+from src.transport import ACCOUNT_FIELDS, REDACTED_FIELDS, RecordingTransport
+
+FIXTURES_PATH = Path(__file__).parent.parent / "fixtures" / "iol_responses.json"
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def refresh_session(
+    auth: IOLAuth,
+    make_client: Callable[[str], IOLClient],
+    username: str = "user",
+    password: str = "password",
+    refreshes: int = 2,
+) -> Dict[str, float]:
+    """
+    Log in and run dashboard refreshes (portfolio, cuentas, quotes, rates).
+
+    Args:
+        auth: IOLAuth using the transport under test
+        make_client: Builds an IOLClient from an access token
+        username: IOL username
+        password: IOL password
+        refreshes: Number of consecutive refreshes
+
+    Returns:
+        Valuation totals of the last refresh
+    """
+    token = auth.login(username, password)
+    client = make_client(token["access_token"])
+    rates = RateCache(client, ttl=0)
+
+    totals: Dict[str, float] = {}
+    for _ in range(refreshes):
+        portfolio = client.get_portfolio()
+        cuentas = client.get_account_status()["cuentas"]
+        client.get_quotes("acciones")
+        client.get_quotes("cedears")
+        valuation = value_portfolio(portfolio, cuentas, rates.get())
+        totals = valuation_totals(valuation)
+    return totals
+
+
+def _simulate(path: Path) -> None:
+    """Record the session against `responses` mocks built from fixtures."""
+    import responses
+
+    fixtures = json.loads(FIXTURES_PATH.read_text())
+    base = IOLClient.BASE_URL
+    recorder = RecordingTransport()
+
+    with responses.RequestsMock() as mock:
+        mock.add(
+            "POST", f"{base}{IOLAuth.TOKEN_ENDPOINT}", json=fixtures["login_success"]
+        )
+        mock.add(
+            "GET",
+            f"{base}/api/v2/portafolio/argentina",
+            json=fixtures["portfolio_example"],
+            headers={"ETag": '"portafolio-1"'},
+        )
+        mock.add("GET", f"{base}/api/v2/portafolio/argentina", status=304)
+        mock.add("GET", f"{base}/api/v2/estadocuenta", json=fixtures["account_status"])
+        for instrument in ("acciones", "cedears"):
+            mock.add(
+                "GET",
+                f"{base}/api/v2/Cotizaciones/{instrument}/argentina/Todos",
+                json=fixtures["quotes_example"],
+            )
+        mock.add("GET", f"{base}/api/v2/Cotizaciones/MEP/AL30", json=1000.0)
+        mock.add(
+            "GET",
+            f"{base}/api/v2/bCBA/Titulos/AL30/Cotizacion",
+            json={"ultimoPrecio": 60000.0},
+        )
+        mock.add(
+            "GET",
+            f"{base}/api/v2/bCBA/Titulos/AL30C/Cotizacion",
+            json={"ultimoPrecio": 57.5},
+        )
+
+        refresh_session(
+            IOLAuth(transport=recorder),
+            lambda token: IOLClient(token, transport=recorder),
+        )
+
+    recorder.save(path)
+
+
+def main(argv) -> None:
+    """Record a cassette (real API unless --simulate)."""
+    if "--simulate" in argv:
+        _simulate(Path(argv[-1]))
+        return
+
+    path = Path(argv[-1]).resolve()
+    if REPO_ROOT in path.parents:
+        sys.exit(
+            f"Refusing to write a real account recording inside the repository "
+            f"({path}); choose a path outside {REPO_ROOT}."
+        )
+    print(
+        "Warning: the recording contains real positions and balances; "
+        "do not commit or share it.",
+        file=sys.stderr,
+    )
+
+    recorder = RecordingTransport(redact=REDACTED_FIELDS + ACCOUNT_FIELDS)
+    refresh_session(
+        IOLAuth(transport=recorder),
+        lambda token: IOLClient(token, transport=recorder),
+        os.environ["IOL_USERNAME"],
+        os.environ["IOL_PASSWORD"],
+    )
+    recorder.save(path)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
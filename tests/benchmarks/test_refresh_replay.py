@@ -0,0 +1,50 @@
+"""Replay benchmarks for end-to-end dashboard refreshes."""
+
+from pathlib import Path
+
+import pytest
+
+from src.api_client import IOLClient
+from src.auth import IOLAuth
+from src.transport import ReplayTransport
+from tests.benchmarks.session import refresh_session
+
+CASSETTES = Path(__file__).parent.parent / "fixtures" / "cassettes"
+
+
+@pytest.fixture
+def replay():
+    """Max-speed replay of the reference refresh session."""
+    return ReplayTransport.from_file(CASSETTES / "refresh_session.json")
+
+
+def run_session(replay):
+    """Replay one full login + refresh session."""
+    replay.rewind()
+    return refresh_session(
+        IOLAuth(transport=replay),
+        lambda token: IOLClient(token, transport=replay),
+    )
+
+
+class TestRefreshReplay:
+    """End-to-end refresh latency and allocations."""
+
+    def test_refresh_session(self, replay, replay_benchmark):
+        """Benchmark login plus two refreshes at max speed."""
+        totals, stats = replay_benchmark(lambda: run_session(replay))
+
+        assert replay.calls == 15
+        assert totals["usd_mep"] == pytest.approx(1515.0005)
+        assert stats["median_ms"] > 0
+
+    def test_quotes_refresh_only(self, replay, replay_benchmark):
+        """Benchmark the quotes fetch + parse path in isolation."""
+
+        def quotes():
+            replay.rewind()
+            return IOLClient("token", transport=replay).get_quotes()
+
+        rows, _ = replay_benchmark(quotes, rounds=50)
+
+        assert rows[0]["simbolo"] == "GGAL"
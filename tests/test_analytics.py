@@ -0,0 +1,135 @@
+"""Tests for portfolio analytics module."""
+
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.analytics import (
+    AnalyticsExecutor,
+    max_drawdown,
+    price_matrix,
+    risk_metrics,
+    volatility,
+)
+
+
+def slow_sum(array):
+    """Module-level helper so the pool can pickle it."""
+    time.sleep(0.5)
+    return float(array.sum())
+
+
+def touch_marker(array):
+    """Module-level helper recording that it ran, in the test's marker dir."""
+    marker = Path(os.environ["ANALYTICS_MARKER_DIR"]) / str(int(array[0]))
+    marker.touch()
+    return int(array[0])
+
+
+@pytest.fixture
+def prices():
+    """Two symbols over five days."""
+    return np.array(
+        [
+            [100.0, 50.0],
+            [110.0, 49.0],
+            [90.0, 52.0],
+            [95.0, 55.0],
+            [120.0, 54.0],
+        ]
+    )
+
+
+@pytest.fixture
+def executor():
+    """Single-worker executor, shut down after the test."""
+    executor = AnalyticsExecutor(max_workers=1)
+    yield executor
+    executor.shutdown()
+
+
+class TestMetrics:
+    """Tests for risk metric functions."""
+
+    def test_max_drawdown(self, prices):
+        """Test peak-to-trough decline per column."""
+        assert max_drawdown(prices) == pytest.approx([90 / 110 - 1, 49 / 50 - 1])
+
+    def test_volatility_single_series(self, prices):
+        """Test 1-D input is treated as one column."""
+        assert volatility(prices[:, 0]).shape == (1,)
+
+    def test_risk_metrics(self, prices):
+        """Test metrics dict shapes."""
+        metrics = risk_metrics(prices)
+
+        assert metrics["total_return"] == pytest.approx([0.2, 0.08])
+        assert metrics["correlation"].shape == (2, 2)
+
+    def test_risk_metrics_without_enough_rows(self):
+        """Test fewer than two days give NaN (or empty) metrics, not errors."""
+        empty = risk_metrics(price_matrix({})[1])
+        single = risk_metrics(np.array([[100.0, 50.0]]))
+
+        assert empty["total_return"].shape == (0,)
+        assert np.isnan(single["volatility"]).all()
+        assert single["correlation"].shape == (2, 2)
+
+    def test_price_matrix_aligns_dates(self):
+        """Test histories are aligned by day and forward-filled."""
+        history = {
+            "GGAL": [
+                {"fechaHora": "2024-01-03T17:00:00", "ultimoPrecio": 102.0},
+                {"fechaHora": "2024-01-02T17:00:00", "ultimoPrecio": 100.0},
+            ],
+            "YPFD": [{"fechaHora": "2024-01-02T17:00:00", "ultimoPrecio": 50.0}],
+        }
+
+        symbols, matrix = price_matrix(history)
+
+        assert symbols == ["GGAL", "YPFD"]
+        assert matrix.tolist() == [[100.0, 50.0], [102.0, 50.0]]
+
+
+class TestAnalyticsExecutor:
+    """Tests for the process-pool executor."""
+
+    def test_result_matches_and_is_cached(self, executor, prices):
+        """Test pool result equals local result and repeats hit the cache."""
+        result = executor.submit("s1", risk_metrics, prices).result(timeout=60)
+
+        np.testing.assert_allclose(result["volatility"], volatility(prices))
+
+        again = executor.submit("s2", risk_metrics, prices.copy())
+        assert again.done()
+        np.testing.assert_allclose(again.result()["volatility"], volatility(prices))
+
+    def test_cancel_session(self, executor):
+        """Test queued jobs of a session are cancelled, others complete."""
+        running = executor.submit("s1", slow_sum, np.ones(10))
+        queued = executor.submit("s2", slow_sum, np.ones(20))
+
+        assert executor.cancel_session("s2") == 1
+        assert queued.cancelled()
+        assert running.result(timeout=60) == 10.0
+
+    def test_cancelled_job_never_runs(self, executor, tmp_path, monkeypatch):
+        """Test a queued job dropped by cancel_session never reaches a worker."""
+        monkeypatch.setenv("ANALYTICS_MARKER_DIR", str(tmp_path))
+        running = executor.submit("s1", slow_sum, np.ones(10))
+        dropped = executor.submit("s2", touch_marker, np.array([7.0]))
+
+        executor.cancel_session("s2")
+        later = executor.submit("s3", touch_marker, np.array([8.0]))
+
+        assert running.result(timeout=60) == 10.0
+        assert later.result(timeout=60) == 8  # single worker runs jobs in order
+        assert dropped.cancelled()
+        assert not (tmp_path / "7").exists()
+        assert (tmp_path / "8").exists()
+        resubmitted = executor.submit("s2", touch_marker, np.array([7.0]))
+        assert not resubmitted.done()  # nothing was cached for the dropped job
+        assert resubmitted.result(timeout=60) == 7
@@ -1,5 +1,6 @@
 """Tests for IOL API Client module."""
 
+import gzip
 import json
 from pathlib import Path
 
@@ -242,6 +243,36 @@ class TestGetQuotes:
         assert len(result) == 2
 
 
+class TestPanels:
+    """Tests for panel and single-quote endpoints."""
+
+    @responses.activate
+    def test_get_panels(self, client):
+        """Test panel listing for an instrument type."""
+        responses.add(
+            responses.GET,
+            f"{client.BASE_URL}/api/v2/argentina/Titulos/Cotizacion/Paneles/acciones",
+            json=[{"panel": "Merval"}, {"panel": "General"}],
+        )
+
+        result = client.get_panels()
+
+        assert [p["panel"] for p in result] == ["Merval", "General"]
+
+    @responses.activate
+    def test_get_panel_quotes(self, client, fixtures):
+        """Test quotes for a single panel."""
+        responses.add(
+            responses.GET,
+            f"{client.BASE_URL}/api/v2/Cotizaciones/acciones/Merval/argentina",
+            json={"titulos": fixtures["quotes_example"]},
+        )
+
+        result = client.get_panel_quotes("Merval")
+
+        assert len(result) == 2
+
+
 class TestGetAccountStatus:
     """Tests for get_account_status method."""
 
@@ -285,3 +316,228 @@ class TestGetInstrumentDetail:
 
         assert result["simbolo"] == "GGAL"
         assert result["mercado"] == "BCBA"
+
+
+class TestRequestCoalescing:
+    """Tests for in-flight deduplication of identical GETs."""
+
+    @responses.activate
+    def test_concurrent_identical_gets_share_one_request(self, client, fixtures):
+        """Test concurrent identical calls send a single HTTP request."""
+        import threading
+        import time
+
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_callback(request):
+            started.set()
+            release.wait(timeout=5)
+            return (200, {}, json.dumps(fixtures["quotes_example"]))
+
+        url = f"{client.BASE_URL}/api/v2/Cotizaciones/acciones/argentina/Todos"
+        responses.add_callback(responses.GET, url, callback=slow_callback)
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(client.get_quotes()))
+            for _ in range(5)
+        ]
+        threads[0].start()
+        assert started.wait(timeout=5)
+        for t in threads[1:]:
+            t.start()
+        time.sleep(0.1)
+        release.set()
+        for t in threads:
+            t.join(timeout=5)
+
+        assert len(responses.calls) == 1
+        assert len(results) == 5
+        assert all(r[0]["simbolo"] == "GGAL" for r in results)
+
+    @responses.activate
+    def test_different_accounts_not_coalesced(self, fixtures):
+        """Test concurrent requests from different tokens are kept separate."""
+        import threading
+
+        tokens = []
+        started = threading.Event()
+        both_started = threading.Event()
+        release = threading.Event()
+
+        def slow_callback(request):
+            tokens.append(request.headers["Authorization"])
+            (both_started if len(tokens) == 2 else started).set()
+            release.wait(timeout=5)
+            return (200, {}, json.dumps(fixtures["portfolio_example"]))
+
+        url = f"{IOLClient.BASE_URL}/api/v2/portafolio/argentina"
+        responses.add_callback(responses.GET, url, callback=slow_callback)
+
+        results = {}
+        threads = [
+            threading.Thread(
+                target=lambda t=token: results.update({t: IOLClient(t).get_portfolio()})
+            )
+            for token in ("token_a", "token_b")
+        ]
+        threads[0].start()
+        assert started.wait(timeout=5)
+        threads[1].start()
+        # token_b's request must reach the server while token_a's is in flight
+        both_started.wait(timeout=1)
+        release.set()
+        for t in threads:
+            t.join(timeout=5)
+
+        assert sorted(tokens) == ["Bearer token_a", "Bearer token_b"]
+        assert set(results) == {"token_a", "token_b"}
+
+    @responses.activate
+    def test_error_propagates_and_clears_inflight(self, client):
+        """Test errors reach the caller and the in-flight slot is released."""
+        url = f"{client.BASE_URL}/api/v2/portafolio/argentina"
+        responses.add(responses.GET, url, status=401)
+
+        with pytest.raises(TokenExpiredError):
+            client.get_portfolio()
+
+        assert client._inflight == {}
+
+
+class TestConditionalRequests:
+    """Tests for conditional GETs and unchanged-payload detection."""
+
+    @responses.activate
+    def test_accept_encoding_negotiated(self, client):
+        """Test client explicitly asks for compressed responses."""
+        assert "gzip" in client.session.headers["Accept-Encoding"]
+
+    @responses.activate
+    def test_etag_replayed_and_304_returns_cached(self, client, fixtures):
+        """Test ETag is sent back and a 304 reuses the previous payload."""
+        url = f"{client.BASE_URL}/api/v2/portafolio/argentina"
+        responses.add(
+            responses.GET,
+            url,
+            json=fixtures["portfolio_example"],
+            headers={"ETag": '"v1"', "Last-Modified": "Mon, 15 Jan 2024 10:00:00 GMT"},
+        )
+        responses.add(responses.GET, url, status=304)
+
+        first = client.get_portfolio()
+        second = client.get_portfolio()
+
+        request_headers = responses.calls[1].request.headers
+        assert request_headers["If-None-Match"] == '"v1"'
+        assert request_headers["If-Modified-Since"] == "Mon, 15 Jan 2024 10:00:00 GMT"
+        assert second["activos"] is first["activos"]
+
+        stats = client.pop_stats()
+        assert stats["requests"] == 2
+        assert stats["not_modified"] == 1
+
+    @responses.activate
+    def test_identical_body_skips_parsing(self, client, fixtures, mocker):
+        """Test identical payload without validators is not parsed again."""
+        url = f"{client.BASE_URL}/api/v2/Cotizaciones/acciones/argentina/Todos"
+        body = json.dumps(fixtures["quotes_example"])
+        responses.add(responses.GET, url, body=body)
+        responses.add(responses.GET, url, body=body)
+
+        first = client.get_quotes()
+        parse = mocker.spy(client, "_parse_body")
+        second = client.get_quotes()
+
+        assert parse.call_count == 0
+        assert second is first
+
+        stats = client.pop_stats()
+        assert stats["bytes_decoded"] == 2 * len(body)
+        assert stats["bytes_parsed"] == len(body)
+        assert stats["unchanged"] == 1
+        assert client.pop_stats()["requests"] == 0
+
+    @responses.activate
+    def test_changed_body_is_parsed(self, client, fixtures):
+        """Test a different payload replaces the cached one."""
+        url = f"{client.BASE_URL}/api/v2/Cotizaciones/acciones/argentina/Todos"
+        responses.add(responses.GET, url, json=fixtures["quotes_example"])
+        responses.add(responses.GET, url, json=fixtures["quotes_market_closed"])
+
+        client.get_quotes()
+        digest = client.payload_digest("/api/v2/Cotizaciones/acciones/argentina/Todos")
+        result = client.get_quotes()
+
+        assert len(result) == 1
+        assert (
+            client.payload_digest("/api/v2/Cotizaciones/acciones/argentina/Todos")
+            != digest
+        )
+
+    @responses.activate
+    def test_wire_size_from_content_length(self, client):
+        """Test compressed size is reported separately from decoded size."""
+        url = f"{client.BASE_URL}/api/v2/estadocuenta"
+        compressed = gzip.compress(b'{"cuentas": []}')
+        responses.add(
+            responses.GET,
+            url,
+            body=compressed,
+            headers={
+                "Content-Encoding": "gzip",
+                "Content-Length": str(len(compressed)),
+            },
+        )
+
+        client.get_account_status()
+        stats = client.pop_stats()
+
+        assert stats["bytes_received"] == len(compressed)
+        assert stats["bytes_decoded"] == len('{"cuentas": []}')
+        assert stats["wire_size_unknown"] == 0
+
+    @responses.activate
+    def test_304_without_cache_raises_api_error(self, client):
+        """Test an unexpected 304 maps to IOLAPIError."""
+        url = f"{client.BASE_URL}/api/v2/estadocuenta"
+        responses.add(responses.GET, url, status=304)
+
+        with pytest.raises(IOLAPIError):
+            client.get_account_status()
+
+    @responses.activate
+    def test_payload_cache_is_bounded(self, client):
+        """Test least recently used payloads are dropped past the limit."""
+        client.MAX_CACHED_PAYLOADS = 2
+        for symbol in ("A", "B", "C"):
+            responses.add(
+                responses.GET,
+                f"{client.BASE_URL}/api/v2/bCBA/Titulos/{symbol}/Cotizacion",
+                json={"ultimoPrecio": 1.0},
+            )
+            client.get_quote(symbol)
+
+        assert len(client._payloads) == 2
+        assert client.payload_digest("/api/v2/bCBA/Titulos/A/Cotizacion") is None
+
+
+class TestGetPriceHistory:
+    """Tests for get_price_history method."""
+
+    @responses.activate
+    def test_get_price_history_url(self, client):
+        """Test date range and adjustment are encoded in the path."""
+        responses.add(
+            responses.GET,
+            f"{client.BASE_URL}/api/v2/bCBA/Titulos/GGAL/Cotizacion/seriehistorica/"
+            "2024-01-01/2024-01-31/ajustada",
+            json=[{"fechaHora": "2024-01-02T17:00:00", "ultimoPrecio": 100.0}],
+        )
+
+        result = client.get_price_history(
+            "GGAL", "2024-01-01", "2024-01-31", adjusted=True
+        )
+
+        assert result[0]["ultimoPrecio"] == 100.0
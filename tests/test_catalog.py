@@ -0,0 +1,206 @@
+"""Tests for instrument catalog module."""
+
+import threading
+
+import responses
+import pytest
+
+from src.api_client import IOLClient
+from src.catalog import InstrumentCatalog
+
+
+@pytest.fixture
+def client():
+    """Create IOLClient instance with test token."""
+    return IOLClient("test_access_token")
+
+
+@pytest.fixture
+def catalog():
+    """Create a small catalog."""
+    catalog = InstrumentCatalog()
+    catalog.add("GGAL", "Grupo Financiero Galicia S.A.", "BCBA", "acciones")
+    catalog.add("GGAL.BA", "Galicia ADR", "BCBA", "cedears")
+    catalog.add("YPFD", "YPF S.A.", "BCBA", "acciones")
+    catalog.add("ALUA", "Aluar Aluminio Argentino", "BCBA", "acciones")
+    catalog.add("TECO2", "Telecom Argentina", "BCBA", "acciones")
+    return catalog
+
+
+class TestSearch:
+    """Tests for catalog search."""
+
+    def test_symbol_prefix(self, catalog):
+        """Test symbol prefix matches with exact match first."""
+        result = catalog.search("ggal")
+
+        assert [r["simbolo"] for r in result] == ["GGAL", "GGAL.BA"]
+
+    def test_description_substring_accent_insensitive(self, catalog):
+        """Test description search ignores case and accents."""
+        catalog.add("BMA", "Banco Macro", "BCBA", "acciones")
+
+        result = catalog.search("ARGÉNTIN")
+
+        assert {r["simbolo"] for r in result} == {"ALUA", "TECO2"}
+
+    def test_no_match(self, catalog):
+        """Test unknown text returns nothing."""
+        assert catalog.search("zzzz") == []
+
+    def test_limit(self, catalog):
+        """Test result count is capped."""
+        assert len(catalog.search("a", limit=1)) == 1
+
+    def test_index_updated_by_add(self, catalog):
+        """Test adds and description changes are searchable immediately."""
+        assert catalog.search("telecom")[0]["simbolo"] == "TECO2"
+
+        catalog.add("TECO2", "Telefonica")
+        catalog.add("PAMP", "Pampa Energia", "BCBA", "acciones")
+
+        assert catalog.search("telecom") == []
+        assert [r["simbolo"] for r in catalog.search("telef")] == ["TECO2"]
+        assert [r["simbolo"] for r in catalog.search("ENERGÍA")] == ["PAMP"]
+        assert [r["simbolo"] for r in catalog.search("pa")] == ["PAMP"]
+
+
+class TestPersistence:
+    """Tests for catalog serialization and disk cache."""
+
+    def test_roundtrip(self, catalog, tmp_path):
+        """Test saved catalog loads with the same records."""
+        path = tmp_path / "catalog.json"
+        catalog.save(path)
+
+        loaded = InstrumentCatalog.load(path)
+
+        assert len(loaded) == len(catalog)
+        assert loaded.get("ypfd") == catalog.get("YPFD")
+        assert loaded.search("telecom")[0]["simbolo"] == "TECO2"
+
+    def test_expired_returns_none(self, catalog, tmp_path):
+        """Test stale cache is ignored."""
+        path = tmp_path / "catalog.json"
+        catalog.save(path)
+
+        assert InstrumentCatalog.load(path, ttl=-1) is None
+
+
+class TestBuild:
+    """Tests for building the catalog from the API."""
+
+    @responses.activate
+    def test_build_and_detail_cache(self, client, tmp_path):
+        """Test catalog build uses listings and fills gaps with details."""
+        responses.add(
+            responses.GET,
+            f"{client.BASE_URL}/api/v2/argentina/Titulos/Cotizacion/Instrumentos",
+            json=[{"instrumento": "Acciones", "pais": "argentina"}],
+        )
+        responses.add(
+            responses.GET,
+            f"{client.BASE_URL}/api/v2/Cotizaciones/acciones/argentina/Todos",
+            json=[
+                {"simbolo": "GGAL", "descripcion": "Grupo Galicia", "mercado": "BCBA"},
+                {"simbolo": "YPFD"},
+            ],
+        )
+        responses.add(
+            responses.GET,
+            f"{client.BASE_URL}/api/v2/bCBA/Titulos/YPFD",
+            json={"simbolo": "YPFD", "descripcion": "YPF S.A.", "mercado": "BCBA"},
+        )
+        path = tmp_path / "catalog.json"
+
+        catalog = InstrumentCatalog.load_or_build(client, path)
+        again = InstrumentCatalog.load_or_build(client, path)
+
+        assert len(responses.calls) == 3
+        assert again.get("YPFD")["descripcion"] == "YPF S.A."
+        assert again.detail(client, "GGAL")["tipo"] == "acciones"
+        assert len(responses.calls) == 3
+        assert catalog.get("GGAL")["mercado"] == "BCBA"
+
+    @responses.activate
+    def test_build_skips_failed_details_and_uses_row_market(self, client):
+        """Test details use the row's market and failures don't abort."""
+        responses.add(
+            responses.GET,
+            f"{client.BASE_URL}/api/v2/argentina/Titulos/Cotizacion/Instrumentos",
+            json=[{"instrumento": "Acciones", "pais": "argentina"}],
+        )
+        responses.add(
+            responses.GET,
+            f"{client.BASE_URL}/api/v2/Cotizaciones/acciones/argentina/Todos",
+            json=[{"simbolo": "AAPL", "mercado": "NYSE"}, {"simbolo": "XXXX"}],
+        )
+        responses.add(
+            responses.GET,
+            f"{client.BASE_URL}/api/v2/nYSE/Titulos/AAPL",
+            json={"simbolo": "AAPL", "descripcion": "Apple Inc."},
+        )
+        responses.add(
+            responses.GET,
+            f"{client.BASE_URL}/api/v2/bCBA/Titulos/XXXX",
+            json={"message": "not found"},
+            status=404,
+        )
+
+        catalog = InstrumentCatalog.build(client)
+
+        assert catalog.get("AAPL")["descripcion"] == "Apple Inc."
+        assert catalog.get("XXXX")["descripcion"] == ""
+
+    @responses.activate
+    def test_failed_listing_and_detail_not_retried(self, client, tmp_path):
+        """Test failed listings are skipped and failed details not refetched."""
+        responses.add(
+            responses.GET,
+            f"{client.BASE_URL}/api/v2/argentina/Titulos/Cotizacion/Instrumentos",
+            json=[{"instrumento": "Bonos"}, {"instrumento": "Acciones"}],
+        )
+        responses.add(
+            responses.GET,
+            f"{client.BASE_URL}/api/v2/Cotizaciones/bonos/argentina/Todos",
+            status=500,
+        )
+        responses.add(
+            responses.GET,
+            f"{client.BASE_URL}/api/v2/Cotizaciones/acciones/argentina/Todos",
+            json=[{"simbolo": "XXXX"}],
+        )
+        responses.add(
+            responses.GET, f"{client.BASE_URL}/api/v2/bCBA/Titulos/XXXX", status=500
+        )
+        path = tmp_path / "catalog.json"
+
+        InstrumentCatalog.load_or_build(client, path)
+        calls = len(responses.calls)
+        loaded = InstrumentCatalog.load(path)
+
+        assert loaded.detail(client, "XXXX") == loaded.get("XXXX")
+        assert len(responses.calls) == calls
+
+
+class TestConcurrency:
+    """Tests for sharing one catalog across threads."""
+
+    def test_concurrent_adds_keep_index_consistent(self):
+        """Test parallel adds neither lose rows nor corrupt the index."""
+        catalog = InstrumentCatalog()
+
+        def add_batch(start):
+            for i in range(start, start + 500):
+                catalog.add(f"S{i:05d}", f"Empresa numero {i:05d}")
+
+        threads = [threading.Thread(target=add_batch, args=(n,)) for n in (0, 500)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(catalog) == 1000
+        assert catalog.search("S00999")[0]["simbolo"] == "S00999"
+        assert catalog.search("numero 00731")[0]["simbolo"] == "S00731"
+        assert len(catalog.search("s00", limit=2000)) == 1000
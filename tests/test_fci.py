@@ -0,0 +1,170 @@
+"""Tests for FCI catalog module."""
+
+import pytest
+import responses
+
+from src.api_client import IOLClient
+from src.exceptions import RateLimitError
+from src.fci import FCICatalog
+from src.rate_limit import RateLimiter
+
+FCI_URL = "https://api.invertironline.com/api/v2/Titulos/FCI"
+
+
+@pytest.fixture
+def client():
+    """Create IOLClient instance with test token."""
+    return IOLClient("test_access_token")
+
+
+@pytest.fixture
+def limiter():
+    """Limiter that never waits."""
+    return RateLimiter(rate=10_000, per=1.0, burst=10_000)
+
+
+def add_hierarchy(ultimo_super=10.0, monto_super=1000.0):
+    """Register a manager with one fund type and two funds."""
+    responses.add(
+        responses.GET,
+        f"{FCI_URL}/Administradoras",
+        json=[{"identificador": "adm", "nombre": "Administradora"}],
+    )
+    responses.add(
+        responses.GET,
+        f"{FCI_URL}/Administradoras/adm/TipoFondos",
+        json=[{"identificador": "renta_fija", "nombre": "Renta Fija"}],
+    )
+    responses.add(
+        responses.GET,
+        f"{FCI_URL}/Administradoras/adm/TipoFondos/renta_fija",
+        json=[
+            {
+                "simbolo": "SUPER",
+                "ultimoOperado": ultimo_super,
+                "montoMinimo": monto_super,
+            },
+            {"simbolo": "AHORRO", "ultimoOperado": 1.0},
+        ],
+    )
+
+
+class TestFCICatalog:
+    """Tests for FCICatalog."""
+
+    @responses.activate
+    def test_refresh_builds_tree(self, client, limiter):
+        """Test the crawl builds the browsable tree with fund details."""
+        add_hierarchy()
+        responses.add(responses.GET, f"{FCI_URL}/SUPER", json={"simbolo": "SUPER"})
+        responses.add(responses.GET, f"{FCI_URL}/AHORRO", json={"simbolo": "AHORRO"})
+        catalog = FCICatalog(client, limiter=limiter)
+
+        assert catalog.is_stale
+        assert catalog.refresh() == 2
+        assert not catalog.is_stale
+        assert catalog.managers() == [{"id": "adm", "nombre": "Administradora"}]
+        assert catalog.fund_types("adm")[0]["id"] == "renta_fija"
+        assert [f["simbolo"] for f in catalog.funds("adm", "renta_fija")] == [
+            "SUPER",
+            "AHORRO",
+        ]
+        assert catalog.fund("SUPER") == {"simbolo": "SUPER"}
+
+    @responses.activate
+    def test_only_changed_leaves_refetched(self, client, limiter, tmp_path):
+        """Test a second crawl fetches details only for changed funds."""
+        path = tmp_path / "fci.json"
+        add_hierarchy()
+        responses.add(responses.GET, f"{FCI_URL}/SUPER", json={"v": 1})
+        responses.add(responses.GET, f"{FCI_URL}/AHORRO", json={"v": 1})
+        FCICatalog(client, path=path, limiter=limiter).refresh()
+
+        responses.reset()
+        add_hierarchy(ultimo_super=11.0, monto_super=5000.0)
+        responses.add(responses.GET, f"{FCI_URL}/SUPER", json={"v": 2})
+        catalog = FCICatalog(client, path=path, limiter=limiter)
+
+        assert not catalog.is_stale
+        assert catalog.refresh() == 1
+        assert catalog.fund("SUPER") == {"v": 2}
+        assert catalog.fund("AHORRO") == {"v": 1}
+
+    @responses.activate
+    def test_daily_fields_do_not_trigger_refetch(self, client, limiter):
+        """Test a new ultimoOperado updates the summary without detail calls."""
+        add_hierarchy()
+        responses.add(responses.GET, f"{FCI_URL}/SUPER", json={"v": 1})
+        responses.add(responses.GET, f"{FCI_URL}/AHORRO", json={"v": 1})
+        catalog = FCICatalog(client, limiter=limiter)
+        catalog.refresh()
+
+        responses.reset()
+        add_hierarchy(ultimo_super=11.0)
+
+        assert catalog.refresh() == 0
+        assert catalog.funds("adm", "renta_fija")[0]["ultimoOperado"] == 11.0
+        assert catalog.fund("SUPER") == {"v": 1}
+
+    @responses.activate
+    def test_failed_detail_keeps_entry_and_backs_off(self, client, limiter):
+        """Test one failing fund doesn't abort the crawl and delays retries."""
+        now = [1e6]
+        add_hierarchy()
+        responses.add(responses.GET, f"{FCI_URL}/SUPER", json={"v": 1})
+        responses.add(responses.GET, f"{FCI_URL}/AHORRO", status=500)
+        catalog = FCICatalog(client, limiter=limiter, clock=lambda: now[0])
+        catalog.RETRY_DELAY = 60.0
+
+        assert catalog.refresh() == 1
+        assert catalog.fund("SUPER") == {"v": 1}
+        assert catalog.fund("AHORRO")["simbolo"] == "AHORRO"  # summary only
+        assert catalog.last_error is not None
+        assert catalog.is_stale
+        assert not catalog.refresh_in_background()
+
+        responses.replace(responses.GET, f"{FCI_URL}/AHORRO", json={"v": 1})
+        now[0] += 61.0
+        assert catalog.refresh_in_background()
+        catalog._thread.join(timeout=5)
+
+        assert catalog.last_error is None
+        assert catalog.fund("AHORRO") == {"v": 1}
+        assert not catalog.is_stale
+
+    @responses.activate
+    def test_background_refresh_only_when_stale(self, client, limiter):
+        """Test browsing never blocks and refresh runs off-thread."""
+        add_hierarchy()
+        responses.add(responses.GET, f"{FCI_URL}/SUPER", json={})
+        responses.add(responses.GET, f"{FCI_URL}/AHORRO", json={})
+        catalog = FCICatalog(client, limiter=limiter)
+
+        assert catalog.funds("adm", "renta_fija") == []
+        assert catalog.refresh_in_background()
+        catalog._thread.join(timeout=5)
+
+        assert catalog.last_error is None
+        assert len(catalog.funds("adm", "renta_fija")) == 2
+        assert not catalog.refresh_in_background()
+
+    @responses.activate
+    def test_rate_limit_stops_crawl(self, client, limiter):
+        """Test a 429 aborts the crawl instead of counting as one failed node."""
+        now = [1e6]
+        add_hierarchy()
+        responses.replace(
+            responses.GET,
+            f"{FCI_URL}/Administradoras/adm/TipoFondos/renta_fija",
+            status=429,
+            headers={"Retry-After": "300"},
+        )
+        catalog = FCICatalog(client, limiter=limiter, clock=lambda: now[0])
+
+        with pytest.raises(RateLimitError):
+            catalog.refresh()
+
+        assert catalog.managers() == []
+        assert all("/FCI/SUPER" not in call.request.url for call in responses.calls)
+        now[0] += 299.0
+        assert not catalog.refresh_in_background()
@@ -0,0 +1,98 @@
+"""Tests for dollar rates module."""
+
+import math
+
+import pytest
+import responses
+
+from src.api_client import IOLClient
+from src.fx import RateCache
+
+
+@pytest.fixture
+def client():
+    """Create IOLClient instance with test token."""
+    return IOLClient("test_access_token")
+
+
+def add_rate_responses(base_url, cable_price=57.5, mep=1000.0):
+    """Register MEP and bond quote mocks."""
+    responses.add(responses.GET, f"{base_url}/api/v2/Cotizaciones/MEP/AL30", json=mep)
+    responses.add(
+        responses.GET,
+        f"{base_url}/api/v2/bCBA/Titulos/AL30/Cotizacion",
+        json={"ultimoPrecio": 60000.0},
+    )
+    responses.add(
+        responses.GET,
+        f"{base_url}/api/v2/bCBA/Titulos/AL30C/Cotizacion",
+        json={"ultimoPrecio": cable_price},
+    )
+
+
+class TestRateCache:
+    """Tests for RateCache."""
+
+    @responses.activate
+    def test_get_fetches_mep_and_implied_ccl(self, client):
+        """Test MEP comes from the endpoint and CCL is implied."""
+        add_rate_responses(client.BASE_URL)
+
+        rates = RateCache(client).get()
+
+        assert rates.mep == 1000.0
+        assert rates.ccl == pytest.approx(60000.0 / 57.5)
+
+    @responses.activate
+    def test_rates_cached_until_ttl(self, client):
+        """Test rates are reused within the TTL and re-fetched after."""
+        add_rate_responses(client.BASE_URL)
+        now = [0.0]
+        cache = RateCache(client, ttl=60, clock=lambda: now[0])
+
+        cache.get()
+        now[0] = 30.0
+        cache.get()
+        assert len(responses.calls) == 3
+
+        now[0] = 61.0
+        cache.get()
+        assert len(responses.calls) == 6
+
+    @responses.activate
+    def test_zero_cable_price_keeps_previous_ccl(self, client):
+        """Test a zero cable price yields NaN, then the last good rate."""
+        now = [0.0]
+        cache = RateCache(client, ttl=60, clock=lambda: now[0])
+
+        add_rate_responses(client.BASE_URL, cable_price=0)
+        assert math.isnan(cache.get().ccl)
+
+        responses.reset()
+        add_rate_responses(client.BASE_URL)
+        now[0] = 61.0
+        good = cache.get().ccl
+
+        responses.reset()
+        add_rate_responses(client.BASE_URL, cable_price=0)
+        now[0] = 122.0
+        assert cache.get().ccl == good
+
+    @responses.activate
+    def test_zero_mep_keeps_previous_rate(self, client):
+        """Test a zero MEP rate yields NaN, then the last good rate."""
+        now = [0.0]
+        cache = RateCache(client, ttl=60, clock=lambda: now[0])
+
+        add_rate_responses(client.BASE_URL, mep=0)
+        assert math.isnan(cache.get().mep)
+
+        responses.reset()
+        add_rate_responses(client.BASE_URL)
+        now[0] = 61.0
+        assert cache.get().mep == 1000.0
+
+        responses.reset()
+        add_rate_responses(client.BASE_URL, mep=0)
+        now[0] = 122.0
+        assert cache.get().mep == 1000.0
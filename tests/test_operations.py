@@ -0,0 +1,153 @@
+"""Tests for operations history module."""
+
+from datetime import date
+
+import pytest
+import responses
+
+from src.api_client import IOLClient
+from src.operations import OperationStore
+
+
+@pytest.fixture
+def client():
+    """Create IOLClient instance with test token."""
+    return IOLClient("test_access_token")
+
+
+@pytest.fixture
+def store():
+    """In-memory operation store."""
+    store = OperationStore()
+    yield store
+    store.close()
+
+
+def operation(
+    numero, tipo, fecha, cantidad, precio, simbolo="GGAL", estado="terminada"
+):
+    """Build an API-shaped operation."""
+    return {
+        "numero": numero,
+        "fechaOrden": fecha,
+        "tipo": tipo,
+        "estado": estado,
+        "mercado": "BCBA",
+        "simbolo": simbolo,
+        "cantidad": cantidad,
+        "precio": precio,
+    }
+
+
+class TestSync:
+    """Tests for incremental sync."""
+
+    @responses.activate
+    def test_first_sync_then_incremental(self, client, store):
+        """Test the cursor narrows the second request to recent dates."""
+        url = f"{client.BASE_URL}/api/v2/operaciones"
+        responses.add(
+            responses.GET,
+            url,
+            json=[
+                operation(1, "Compra", "2024-01-02T11:00:00", 10, 100.0),
+                operation(2, "Compra", "2024-01-05T11:00:00", 5, 10.0, "YPFD"),
+            ],
+        )
+        responses.add(
+            responses.GET,
+            url,
+            json=[
+                operation(2, "Compra", "2024-01-05T11:00:00", 5, 10.0, "YPFD"),
+                operation(3, "Venta", "2024-01-06T11:00:00", 5, 120.0),
+            ],
+        )
+
+        assert store.sync(client, today=date(2024, 1, 5)) == 2
+        assert store.sync(client, today=date(2024, 1, 6)) == 1
+
+        second = responses.calls[1].request.params
+        assert second["filtro.fechaDesde"] == "2024-01-04"
+        assert store.high_water_mark == {"numero": "3", "fecha": "2024-01-06T11:00:00"}
+
+    @responses.activate
+    def test_open_operations_rechecked(self, client, store):
+        """Test pending operations before the window are refreshed."""
+        store.upsert(
+            [
+                operation(
+                    7, "Compra", "2024-01-01T11:00:00", 10, 100.0, estado="pendiente"
+                )
+            ]
+        )
+        store.upsert([operation(8, "Compra", "2024-01-10T11:00:00", 1, 1.0)])
+        responses.add(responses.GET, f"{client.BASE_URL}/api/v2/operaciones", json=[])
+        responses.add(
+            responses.GET,
+            f"{client.BASE_URL}/api/v2/operaciones/7",
+            json={
+                "numero": 7,
+                "mercado": "BCBA",
+                "simbolo": "GGAL",
+                "tipo": "Compra",
+                "fechaAlta": "2024-01-01T11:00:00",
+                "fechaOperado": "2024-01-03T15:30:00",
+                "estadoActual": "terminada",
+                "cantidad": 10,
+                "precio": 100.0,
+                "operaciones": [
+                    {"fecha": "2024-01-02T12:00:00", "cantidad": 4, "precio": 95.0},
+                    {"fecha": "2024-01-03T15:30:00", "cantidad": 6, "precio": 97.5},
+                ],
+            },
+        )
+
+        assert store.sync(client, today=date(2024, 1, 10)) == 1
+        (trade,) = store.trades("GGAL", start="2024-01-03", end="2024-01-03")
+        assert trade["numero"] == 7
+        assert trade["cantidad"] == 10
+        assert trade["precio"] == pytest.approx((4 * 95.0 + 6 * 97.5) / 10)
+
+    def test_same_fields_in_other_shape_not_a_change(self, store):
+        """Test a row re-read with a different payload shape is not changed."""
+        listed = operation(9, "Compra", "2024-01-05T11:00:00", 5, 10.0)
+        store.upsert([listed])
+
+        assert store.upsert([{**listed, "modalidad": "precio_Limite"}]) == 0
+
+
+class TestQueries:
+    """Tests for local queries."""
+
+    def test_trades_by_symbol_and_date(self, store):
+        """Test symbol/date filters and executed-only default."""
+        store.upsert(
+            [
+                operation(1, "Compra", "2024-01-02T11:00:00", 10, 100.0),
+                operation(2, "Compra", "2024-02-02T11:00:00", 10, 100.0),
+                operation(
+                    3, "Compra", "2024-02-03T11:00:00", 1, 1.0, estado="cancelada"
+                ),
+                operation(4, "Compra", "2024-02-04T11:00:00", 1, 1.0, "YPFD"),
+            ]
+        )
+
+        trades = store.trades("ggal", start="2024-02-01", end="2024-02-28")
+
+        assert [t["numero"] for t in trades] == [2]
+        assert len(store.trades("GGAL", executed_only=False)) == 3
+
+    def test_realized_pnl_fifo(self, store):
+        """Test sales are matched against the oldest lots first."""
+        store.upsert(
+            [
+                operation(1, "Compra", "2024-01-02T11:00:00", 10, 100.0),
+                operation(2, "Compra", "2024-01-03T11:00:00", 10, 110.0),
+                operation(3, "Venta", "2024-01-04T11:00:00", 5, 120.0),
+                operation(4, "Venta", "2024-02-04T11:00:00", 10, 130.0),
+            ]
+        )
+
+        assert store.realized_pnl() == {"GGAL": 5 * 20 + 5 * 30 + 5 * 20}
+        assert store.realized_pnl(start="2024-02-01") == {"GGAL": 5 * 30 + 5 * 20}
+        assert store.realized_pnl(end="2024-01-31") == {"GGAL": 100.0}
@@ -0,0 +1,82 @@
+"""Tests for portfolio business logic module."""
+
+import json
+import math
+from pathlib import Path
+
+import pytest
+
+from src.fx import DollarRates
+from src.portfolio import value_portfolio, valuation_totals
+
+
+@pytest.fixture
+def fixtures():
+    """Load test fixtures."""
+    fixtures_path = Path(__file__).parent / "fixtures" / "iol_responses.json"
+    with open(fixtures_path) as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def rates():
+    """Fixed dollar rates."""
+    return DollarRates(mep=1000.0, ccl=1050.0, fetched_at=0.0)
+
+
+class TestValuePortfolio:
+    """Tests for multi-currency valuation."""
+
+    def test_positions_and_accounts(self, fixtures, rates):
+        """Test every position and account gets ARS and USD values."""
+        portfolio = {"activos": fixtures["portfolio_example"]["activos"]}
+        cuentas = fixtures["account_status"]["cuentas"]
+
+        valuation = value_portfolio(portfolio, cuentas, rates)
+
+        assert list(valuation["origen"]) == ["activo", "activo", "cuenta", "cuenta"]
+        assert valuation.loc[0, "ars"] == 15000.50
+        assert valuation.loc[3, "ars"] == 1000.0 * rates.mep
+        assert valuation.loc[3, "usd_mep"] == 1000.0
+        assert valuation.loc[2, "usd_ccl"] == pytest.approx(50000.0 / rates.ccl)
+
+    def test_dollar_position(self, rates):
+        """Test positions quoted in dollars are converted at MEP."""
+        portfolio = {
+            "activos": [
+                {
+                    "titulo": {"simbolo": "AAPL", "moneda": "dolar_Estadounidense"},
+                    "valorizado": 10.0,
+                }
+            ]
+        }
+
+        valuation = value_portfolio(portfolio, [], rates)
+
+        assert valuation.loc[0, "ars"] == 10000.0
+
+    def test_totals(self, fixtures, rates):
+        """Test totals per currency view."""
+        cuentas = fixtures["account_status"]["cuentas"]
+
+        totals = valuation_totals(value_portfolio({"activos": []}, cuentas, rates))
+
+        assert totals["ars"] == 50000.0 + 1000.0 * rates.mep
+        assert totals["usd_mep"] == pytest.approx(1050.0)
+
+    def test_totals_without_ccl_rate(self, fixtures):
+        """Test a missing CCL rate gives a NaN total, not a partial sum."""
+        rates = DollarRates(mep=1000.0, ccl=math.nan, fetched_at=0.0)
+        cuentas = fixtures["account_status"]["cuentas"]
+
+        totals = valuation_totals(value_portfolio({"activos": []}, cuentas, rates))
+
+        assert totals["usd_mep"] == pytest.approx(1050.0)
+        assert math.isnan(totals["usd_ccl"])
+
+    def test_empty(self, rates):
+        """Test empty inputs produce an empty frame."""
+        valuation = value_portfolio({"activos": []}, [], rates)
+
+        assert valuation.empty
+        assert valuation_totals(valuation)["ars"] == 0.0
@@ -0,0 +1,195 @@
+"""Tests for quote request planning module."""
+
+import json
+from pathlib import Path
+
+import pytest
+import responses
+
+from src.api_client import IOLClient
+from src.quote_planner import (
+    PANEL_SIZE_ESTIMATE,
+    REQUEST_COST,
+    TODOS_SIZE_ESTIMATE,
+    fetch_quotes,
+    plan_quotes,
+)
+
+PANELS_URL = "https://api.invertironline.com/api/v2/{}/Titulos/Cotizacion/Paneles/{}"
+
+
+@pytest.fixture
+def fixtures():
+    """Load test fixtures."""
+    fixtures_path = Path(__file__).parent / "fixtures" / "iol_responses.json"
+    with open(fixtures_path) as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def client():
+    """Create IOLClient instance with test token."""
+    return IOLClient("test_access_token")
+
+
+class TestPlanQuotes:
+    """Tests for plan_quotes function."""
+
+    def test_few_symbols_use_single_calls(self):
+        """Test a small set is cheaper per symbol than a big panel."""
+        panels = {"Todos": {f"S{i}" for i in range(500)}}
+
+        plan = plan_quotes({"S1", "S2"}, panels)
+
+        assert plan.panels == ()
+        assert plan.symbols == ("S1", "S2")
+        assert plan.cost == 2 * (REQUEST_COST + 1)
+
+    def test_dense_panel_preferred(self):
+        """Test a panel covering most wanted symbols is chosen."""
+        merval = {f"M{i}" for i in range(20)}
+        panels = {"Merval": merval, "Todos": merval | {f"S{i}" for i in range(500)}}
+
+        plan = plan_quotes(merval | {"S1"}, panels)
+
+        assert plan.panels == ("Merval",)
+        assert plan.symbols == ("S1",)
+
+    def test_unknown_symbols_fetched_individually(self):
+        """Test symbols not in any known panel fall back to single calls."""
+        plan = plan_quotes({"GGAL"}, {})
+
+        assert plan.symbols == ("GGAL",)
+
+    def test_estimated_panel_used_for_large_sets(self):
+        """Test a panel of unknown membership is planned from its size estimate."""
+        wanted = {f"S{i}" for i in range(30)}
+
+        plan = plan_quotes(wanted, {"Todos": None})
+
+        assert plan.panels == ("Todos",)
+        assert plan.symbols == ()
+        assert plan.cost == REQUEST_COST + TODOS_SIZE_ESTIMATE
+
+    def test_small_unknown_panel_explored_first(self):
+        """Test a cheap unknown panel is tried before Todos, then planning stops."""
+        wanted = {f"S{i}" for i in range(40)}
+
+        plan = plan_quotes(wanted, {"Todos": None, "Merval": None})
+
+        assert plan.panels == ("Merval",)
+        assert plan.cost == REQUEST_COST + PANEL_SIZE_ESTIMATE + 40 * (REQUEST_COST + 1)
+
+
+class TestFetchQuotes:
+    """Tests for fetch_quotes function."""
+
+    @responses.activate
+    def test_fetch_mixes_panel_and_single(self, client, fixtures):
+        """Test panel rows are filtered and singles fill the gaps."""
+        responses.add(
+            responses.GET,
+            f"{client.BASE_URL}/api/v2/Cotizaciones/acciones/Merval/argentina",
+            json=fixtures["quotes_example"],
+        )
+        responses.add(
+            responses.GET,
+            f"{client.BASE_URL}/api/v2/bCBA/Titulos/ALUA/Cotizacion",
+            json={"ultimoPrecio": 900.0},
+        )
+        panels = {"Merval": {"GGAL", "YPFD"}}
+
+        result = fetch_quotes(client, {"GGAL", "YPFD", "ALUA"}, panels)
+
+        assert set(result) == {"GGAL", "YPFD", "ALUA"}
+        assert result["ALUA"] == {"simbolo": "ALUA", "ultimoPrecio": 900.0}
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_stale_membership_refreshed(self, client, fixtures):
+        """Test panel membership is learned and missing symbols still fetched."""
+        responses.add(
+            responses.GET,
+            f"{client.BASE_URL}/api/v2/Cotizaciones/acciones/Merval/argentina",
+            json=fixtures["quotes_example"],
+        )
+        responses.add(
+            responses.GET,
+            f"{client.BASE_URL}/api/v2/bCBA/Titulos/PAMP/Cotizacion",
+            json={"ultimoPrecio": 1.0},
+        )
+        panels = {"Merval": {"GGAL", "YPFD", "PAMP"}}
+
+        result = fetch_quotes(client, {"GGAL", "YPFD", "PAMP"}, panels)
+
+        assert panels["Merval"] == {"GGAL", "YPFD"}
+        assert result["PAMP"]["ultimoPrecio"] == 1.0
+
+    @responses.activate
+    def test_membership_bootstrapped_from_todos(self, client):
+        """Test a large set with no listed panels fetches Todos once."""
+        responses.add(
+            responses.GET, PANELS_URL.format("argentina", "acciones"), json=[]
+        )
+        rows = [{"simbolo": f"S{i}", "ultimoPrecio": float(i)} for i in range(30)]
+        responses.add(
+            responses.GET,
+            f"{client.BASE_URL}/api/v2/Cotizaciones/acciones/argentina/Todos",
+            json={"titulos": rows + [{"simbolo": None}, {"simbolo": ""}]},
+        )
+        panels = {}
+
+        result = fetch_quotes(client, {f"S{i}" for i in range(30)}, panels)
+
+        assert len(result) == 30
+        assert len(responses.calls) == 2
+        assert panels["Todos"] == {f"S{i}" for i in range(30)}
+
+    @responses.activate
+    def test_single_calls_use_country_market(self, client):
+        """Test per-symbol calls use the market of the requested country."""
+        responses.add(
+            responses.GET, PANELS_URL.format("estados_Unidos", "acciones"), json=[]
+        )
+        responses.add(
+            responses.GET,
+            f"{client.BASE_URL}/api/v2/nYSE/Titulos/AAPL/Cotizacion",
+            json={"ultimoPrecio": 190.0},
+        )
+
+        result = fetch_quotes(client, {"AAPL"}, {}, country="estados_Unidos")
+
+        assert result["AAPL"]["ultimoPrecio"] == 190.0
+
+    @responses.activate
+    def test_panels_discovered_and_learned(self, client):
+        """Test an empty panel map discovers panels and reuses their members."""
+        merval = [{"simbolo": f"M{i}", "ultimoPrecio": 1.0} for i in range(20)]
+        responses.add(
+            responses.GET,
+            PANELS_URL.format("argentina", "acciones"),
+            json=[{"panel": "Merval"}, {"panel": "General"}],
+        )
+        responses.add(
+            responses.GET,
+            f"{client.BASE_URL}/api/v2/Cotizaciones/acciones/Merval/argentina",
+            json={"titulos": merval},
+        )
+        responses.add(
+            responses.GET,
+            f"{client.BASE_URL}/api/v2/bCBA/Titulos/ALUA/Cotizacion",
+            json={"ultimoPrecio": 900.0},
+        )
+        wanted = {f"M{i}" for i in range(10)} | {"ALUA"}
+        panels = {}
+
+        first = fetch_quotes(client, wanted, panels)
+
+        assert set(first) == wanted
+        assert panels["Merval"] == {f"M{i}" for i in range(20)}
+        assert panels["General"] is None and panels["Todos"] is None
+        assert len(responses.calls) == 3  # panels, Merval, ALUA
+
+        fetch_quotes(client, wanted, panels)
+
+        assert len(responses.calls) == 5  # Merval, ALUA: no rediscovery
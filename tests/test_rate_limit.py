@@ -0,0 +1,27 @@
+"""Tests for client-side rate limiting module."""
+
+from src.rate_limit import RateLimiter
+
+
+class TestRateLimiter:
+    """Tests for RateLimiter token bucket."""
+
+    def test_burst_then_waits(self):
+        """Test requests beyond the burst wait for the refill interval."""
+        now = [0.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        limiter = RateLimiter(
+            rate=60, per=60.0, burst=2, clock=lambda: now[0], sleep=sleep
+        )
+
+        limiter.acquire()
+        limiter.acquire()
+        assert sleeps == []
+
+        limiter.acquire()
+        assert sleeps == [1.0]
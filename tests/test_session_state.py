@@ -0,0 +1,130 @@
+"""Tests for session state module."""
+
+import pytest
+
+from src.session_state import SessionManager, SharedStore, deep_sizeof, freeze
+
+QUOTES = [{"simbolo": "GGAL", "ultimoPrecio": 150.0}] * 50
+
+
+@pytest.fixture
+def now():
+    """Mutable fake clock."""
+    return [0.0]
+
+
+@pytest.fixture
+def manager(now):
+    """Manager with a generous budget and a fake clock."""
+    return SessionManager(budget_bytes=10**7, min_idle=60, clock=lambda: now[0])
+
+
+class TestFreeze:
+    """Tests for freeze helper."""
+
+    def test_freeze_is_deep_and_read_only(self):
+        """Test nested dicts and lists become immutable."""
+        frozen = freeze({"titulos": [{"simbolo": "GGAL"}]})
+
+        assert frozen["titulos"][0]["simbolo"] == "GGAL"
+        with pytest.raises(TypeError):
+            frozen["titulos"][0]["simbolo"] = "YPFD"
+
+    def test_frozen_size_counts_wrapped_dicts(self):
+        """Test frozen data is not reported smaller than the original."""
+        data = {"titulos": [{"simbolo": f"S{i}", "precio": i} for i in range(50)]}
+
+        assert deep_sizeof(freeze(data)) >= deep_sizeof(data)
+
+
+class TestSharedStore:
+    """Tests for SharedStore."""
+
+    def test_put_deduplicates_by_key(self):
+        """Test the same key keeps a single copy."""
+        store = SharedStore()
+
+        first = store.put("digest", QUOTES)
+        second = store.put("digest", list(QUOTES))
+
+        assert first is second
+
+    def test_only_unreferenced_entries_evicted(self):
+        """Test referenced entries survive eviction."""
+        store = SharedStore()
+        store.put("a", QUOTES)
+        store.put("b", QUOTES)
+        store.acquire("a")
+
+        store.evict_unreferenced(10**9)
+
+        assert "a" in store
+        assert "b" not in store
+
+
+class TestSessionManager:
+    """Tests for SessionManager."""
+
+    def test_sessions_share_market_data(self, manager):
+        """Test two sessions reference one shared copy."""
+        a = manager.share("s1", "quotes:acciones", "d1", QUOTES)
+        b = manager.share("s2", "quotes:acciones", "d1", QUOTES)
+
+        assert a is b
+        assert manager.get("s2", "quotes:acciones") is a
+        assert manager.store.refcount("d1") == 2
+
+    def test_replacing_reference_releases_old(self, manager):
+        """Test new payload keys release the previous one."""
+        manager.share("s1", "quotes:acciones", "d1", QUOTES)
+        manager.share("s1", "quotes:acciones", "d2", QUOTES[:1])
+
+        assert manager.store.refcount("d1") == 0
+        assert manager.store.refcount("d2") == 1
+
+    def test_deltas_are_per_session(self, manager):
+        """Test per-user components are isolated."""
+        manager.set("s1", "preferences", {"tema": "oscuro"})
+
+        assert manager.get("s1", "preferences") == {"tema": "oscuro"}
+        assert manager.get("s2", "preferences") is None
+
+    def test_budget_evicts_idle_sessions_lru(self, now):
+        """Test the oldest idle session is evicted when over budget."""
+        portfolio = {"activos": [{"cantidad": i} for i in range(100)]}
+        size = deep_sizeof(portfolio)
+        manager = SessionManager(
+            budget_bytes=int(size * 2.5), min_idle=60, clock=lambda: now[0]
+        )
+
+        manager.set("old", "portfolio", portfolio)
+        now[0] = 10
+        manager.set("mid", "portfolio", portfolio)
+        now[0] = 100
+        manager.set("new", "portfolio", portfolio)
+
+        assert not manager.has_session("old")
+        assert manager.has_session("mid")
+        assert manager.total_bytes() <= manager.budget_bytes
+
+    def test_active_sessions_not_evicted(self, now):
+        """Test sessions used within min_idle are kept even over budget."""
+        manager = SessionManager(budget_bytes=1, min_idle=60, clock=lambda: now[0])
+
+        manager.set("s1", "portfolio", {"activos": []})
+        manager.set("s2", "portfolio", {"activos": []})
+
+        assert manager.has_session("s1") and manager.has_session("s2")
+
+    def test_memory_report(self, manager):
+        """Test report breaks usage down per component."""
+        manager.set("s1", "cuentas", [{"tipo": "PESOS"}])
+        manager.share("s1", "quotes:acciones", "d1", QUOTES)
+
+        report = manager.memory_report()
+
+        assert report["shared"]["d1"]["refs"] == 1
+        assert report["sessions"]["s1"]["cuentas"] > 0
+        assert report["total_bytes"] == (
+            report["shared"]["d1"]["bytes"] + report["sessions"]["s1"]["cuentas"]
+        )
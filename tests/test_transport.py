@@ -0,0 +1,130 @@
+"""Tests for HTTP transport module."""
+
+import gzip
+
+import pytest
+import responses
+from responses import matchers
+
+from src.api_client import IOLClient
+from src.auth import IOLAuth
+from src.exceptions import NetworkError
+from src.transport import (
+    ACCOUNT_FIELDS,
+    REDACTED_FIELDS,
+    RecordingTransport,
+    ReplayTransport,
+    load_cassette,
+)
+
+
+@pytest.fixture
+def recorded(tmp_path):
+    """Record a short session and return the cassette path."""
+    recorder = RecordingTransport()
+    base = IOLClient.BASE_URL
+    with responses.RequestsMock() as mock:
+        mock.add(
+            "POST",
+            f"{base}/token",
+            json={"access_token": "secret", "refresh_token": "secret2"},
+        )
+        mock.add(
+            "GET",
+            f"{base}/api/v2/operaciones",
+            json=[{"numero": 1}],
+            match=[matchers.query_param_matcher({"filtro.estado": "terminadas"})],
+        )
+        mock.add("GET", f"{base}/api/v2/estadocuenta", json={"cuentas": [1]})
+        mock.add("GET", f"{base}/api/v2/estadocuenta", json={"cuentas": [1, 2]})
+
+        IOLAuth(transport=recorder).login("user", "pass")
+        client = IOLClient("token", transport=recorder)
+        client.get_operations(status="terminadas")
+        client.get_account_status()
+        client.get_account_status()
+
+    path = tmp_path / "session.json.gz"
+    recorder.save(path)
+    return path
+
+
+class TestRecordReplay:
+    """Tests for RecordingTransport and ReplayTransport."""
+
+    def test_cassette_is_compact_and_redacted(self, recorded):
+        """Test gzip cassette drops token values."""
+        assert recorded.read_bytes()[:2] == b"\x1f\x8b"
+        interactions = load_cassette(recorded)
+
+        assert len(interactions) == 4
+        assert "secret" not in interactions[0]["body"]
+
+    @responses.activate
+    def test_decoded_body_recorded_without_content_encoding(self):
+        """Test the cassette doesn't claim an encoding its body doesn't have."""
+        compressed = gzip.compress(b'{"cuentas": []}')
+        responses.add(
+            responses.GET,
+            f"{IOLClient.BASE_URL}/api/v2/estadocuenta",
+            body=compressed,
+            headers={
+                "Content-Encoding": "gzip",
+                "Content-Length": str(len(compressed)),
+            },
+        )
+        recorder = RecordingTransport()
+
+        IOLClient("token", transport=recorder).get_account_status()
+
+        interaction = recorder.interactions[0]
+        assert interaction["body"] == '{"cuentas": []}'
+        assert "Content-Encoding" not in interaction["headers"]
+        assert interaction["headers"]["Content-Length"] == str(len(compressed))
+
+    @responses.activate
+    def test_account_fields_redacted_at_any_depth(self):
+        """Test account identifiers in nested bodies are redacted on request."""
+        responses.add(
+            responses.GET,
+            f"{IOLClient.BASE_URL}/api/v2/estadocuenta",
+            json={"cuentas": [{"numero": "123-456", "saldo": 10.0}]},
+        )
+        recorder = RecordingTransport(redact=REDACTED_FIELDS + ACCOUNT_FIELDS)
+
+        IOLClient("token", transport=recorder).get_account_status()
+
+        body = recorder.interactions[0]["body"]
+        assert "123-456" not in body
+        assert '"saldo":10.0' in body
+
+    def test_replay_in_order(self, recorded):
+        """Test responses replay in recorded order, matching query params."""
+        replay = ReplayTransport.from_file(recorded)
+        client = IOLClient("token", transport=replay)
+
+        assert client.get_operations(status="terminadas") == [{"numero": 1}]
+        assert client.get_account_status()["cuentas"] == [1]
+        assert client.get_account_status()["cuentas"] == [1, 2]
+        assert client.get_account_status()["cuentas"] == [1, 2]
+        assert replay.calls == 4
+
+    def test_unrecorded_request_raises_network_error(self, recorded):
+        """Test unmatched requests surface as NetworkError."""
+        client = IOLClient("token", transport=ReplayTransport.from_file(recorded))
+
+        with pytest.raises(NetworkError):
+            client.get_portfolio()
+
+    def test_realtime_replay_sleeps_recorded_latency(self, recorded):
+        """Test realtime mode sleeps each latency scaled by speed."""
+        sleeps = []
+        interactions = load_cassette(recorded)
+        interactions[0]["latency"] = 0.5
+        replay = ReplayTransport(
+            interactions, realtime=True, speed=2.0, sleep=sleeps.append
+        )
+
+        IOLAuth(transport=replay).login("user", "pass")
+
+        assert sleeps == [0.25]